@@ -2,97 +2,132 @@ import os
 import json
 import importlib.util
 import sys
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 import traceback
 
+# Dynamic imports mutate sys.modules (global state), so serialize them when
+# protocols are fetched concurrently.
+_IMPORT_LOCK = threading.Lock()
+
+# Loaded modules keyed by (path, mtime): when the collector runs in a loop the
+# read/compile/exec of each TPS file (and its heavy top-level imports) happens
+# once per file version instead of once per tick.
+_MODULE_CACHE = {}
+
 def import_tps_module(protocol_path, module_name):
     """
     Dynamically import TPS modules from protocol directories
     """
     try:
         full_path = os.path.join(protocol_path, module_name)
+
+        cache_key = (full_path, os.path.getmtime(full_path))
+        cached = _MODULE_CACHE.get(cache_key)
+        if cached is not None:
+            return cached
+
         print(f"Loading module from: {full_path}")
-        
-        spec = importlib.util.spec_from_file_location(module_name, full_path)
-        if spec is None:
-            print(f"Could not load spec for {module_name}")
-            return None
-            
-        module = importlib.util.module_from_spec(spec)
-        sys.modules[module_name] = module
-        spec.loader.exec_module(module)
-        return module
+
+        # Prefix with the protocol directory so two protocols shipping the
+        # same file name don't clobber each other in sys.modules.
+        registered_name = f"{os.path.basename(protocol_path).lower()}_{os.path.splitext(module_name)[0]}"
+
+        with _IMPORT_LOCK:
+            spec = importlib.util.spec_from_file_location(registered_name, full_path)
+            if spec is None:
+                print(f"Could not load spec for {module_name}")
+                return None
+
+            module = importlib.util.module_from_spec(spec)
+            sys.modules[registered_name] = module
+            spec.loader.exec_module(module)
+            _MODULE_CACHE[cache_key] = module
+            return module
     except Exception as e:
         print(f"Error importing {module_name}: {str(e)}")
         print(traceback.format_exc())
         return None
 
+def _fetch_one(protocol, protocol_dir, now_iso):
+    """
+    Fetch TPS data for a single protocol; returns (protocol, result_dict)
+    """
+    protocol_path = os.path.join(protocol_dir, protocol)
+    tps_file = f"{protocol.lower()}_tps.py"
+
+    print(f"\nChecking {protocol}...")
+    if not os.path.exists(os.path.join(protocol_path, tps_file)):
+        print(f"File not found: {tps_file}")
+        return protocol, {
+            "tps": 0,
+            "status": "error",
+            "error": "TPS file not found"
+        }
+
+    try:
+        module = import_tps_module(protocol_path, tps_file)
+        if module and hasattr(module, 'fetch_tps_data'):
+            tps_data = module.fetch_tps_data()
+
+            # Ensure numeric TPS value
+            if isinstance(tps_data, (dict, list)):
+                print(f"Warning: {protocol} returned complex data structure")
+                tps_value = 0
+            else:
+                try:
+                    tps_value = float(tps_data)
+                except (TypeError, ValueError):
+                    tps_value = 0
+
+            return protocol, {
+                "tps": tps_value,
+                "status": "success" if tps_value > 0 else "error",
+                "timestamp": now_iso
+            }
+        else:
+            return protocol, {
+                "tps": 0,
+                "status": "error",
+                "error": "Invalid module structure"
+            }
+    except Exception as e:
+        print(f"Error processing {protocol}: {str(e)}")
+        print(traceback.format_exc())
+        return protocol, {
+            "tps": 0,
+            "status": "error",
+            "error": str(e)
+        }
+
 def collect_tps_data():
     """
-    Collect TPS data from all protocol implementations
+    Collect TPS data from all protocol implementations concurrently
     """
     # Base protocol directory - using absolute path
     base_dir = os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(__file__))))
     protocol_dir = os.path.join(base_dir, "protocol")
-    
+
     print(f"Protocol directory: {protocol_dir}")
-    
+
+    # One timestamp per collection run; datetime.now() costs a syscall plus
+    # tz handling and the per-protocol granularity was never meaningful.
+    now_iso = datetime.now().isoformat()
+
     results = {
-        "timestamp": datetime.now().isoformat(),
+        "timestamp": now_iso,
         "protocols": {}
     }
-    
+
     protocols = ["Avail", "Celestia", "Espresso", "Near", "Polkadot"]
-    
-    for protocol in protocols:
-        protocol_path = os.path.join(protocol_dir, protocol)
-        tps_file = f"{protocol.lower()}_tps.py"
-        
-        print(f"\nChecking {protocol}...")
-        if not os.path.exists(os.path.join(protocol_path, tps_file)):
-            print(f"File not found: {tps_file}")
-            results["protocols"][protocol] = {
-                "tps": 0,
-                "status": "error",
-                "error": "TPS file not found"
-            }
-            continue
-            
-        try:
-            module = import_tps_module(protocol_path, tps_file)
-            if module and hasattr(module, 'fetch_tps_data'):
-                tps_data = module.fetch_tps_data()
-                
-                # Ensure numeric TPS value
-                if isinstance(tps_data, (dict, list)):
-                    print(f"Warning: {protocol} returned complex data structure")
-                    tps_value = 0
-                else:
-                    try:
-                        tps_value = float(tps_data)
-                    except (TypeError, ValueError):
-                        tps_value = 0
-                        
-                results["protocols"][protocol] = {
-                    "tps": tps_value,
-                    "status": "success" if tps_value > 0 else "error",
-                    "timestamp": datetime.now().isoformat()
-                }
-            else:
-                results["protocols"][protocol] = {
-                    "tps": 0,
-                    "status": "error",
-                    "error": "Invalid module structure"
-                }
-        except Exception as e:
-            print(f"Error processing {protocol}: {str(e)}")
-            print(traceback.format_exc())
-            results["protocols"][protocol] = {
-                "tps": 0,
-                "status": "error",
-                "error": str(e)
-            }
-    
+
+    # Each fetch_tps_data() blocks on external HTTP, so overlap the waits:
+    # wall time becomes max(latencies) instead of their sum.
+    with ThreadPoolExecutor(max_workers=len(protocols)) as executor:
+        for protocol, data in executor.map(lambda p: _fetch_one(p, protocol_dir, now_iso), protocols):
+            results["protocols"][protocol] = data
+
     return results
 
 def save_results(results):
@@ -23,26 +23,130 @@ Usage:
 """
 
 import argparse
+import asyncio
+import gzip
+import http.client
 import json
+import re
 import sys
 import time
-import urllib.request
-import urllib.error
+import zlib
+from urllib.parse import urlsplit
+
+try:
+    import aiohttp  # optional: only needed for the *_async snapshot API
+except ImportError:
+    aiohttp = None
+
+# orjson parses/encodes several times faster and works on bytes directly,
+# skipping the utf-8 decode of each RPC response; stdlib json is the fallback.
+try:
+    import orjson
+    _loads = orjson.loads
+    def _dumps(obj) -> bytes:
+        return orjson.dumps(obj)
+except ImportError:
+    _loads = json.loads
+    def _dumps(obj) -> bytes:
+        return json.dumps(obj).encode("utf-8")
+
+# Prometheus exposition line: metric name, optional {labels} blob, value.
+# Compiled once; one C-level match replaces the per-line chain of .split calls.
+_METRIC_RE = re.compile(r'^([a-zA-Z_:][a-zA-Z0-9_:]*)(\{[^}]*\})?\s+(\S+)')
+_LABEL_RE = re.compile(r'([a-zA-Z_][a-zA-Z0-9_]*)="([^"]*)"')
+
+def _wanted_metric(name: str) -> bool:
+    """Cheap name-only test mirroring the scrape_metrics branches, used to
+    reject ~99% of exporter lines before any real parsing happens."""
+    if name.startswith("substrate_block_height"):
+        return True
+    if "sync_peers" in name and "substrate" in name:
+        return True
+    if "txpool" in name and ("queued" in name or "validations" in name):
+        return True
+    if "grandpa" in name and ("round" in name or "votes" in name):
+        return True
+    if "peers" in name and "network" in name:
+        return True
+    return False
 
 DEFAULT_RPC = "http://127.0.0.1:9944"
 
-def http_post(url: str, payload: dict, timeout: float = 5.0) -> dict:
-    data = json.dumps(payload).encode("utf-8")
-    req = urllib.request.Request(url, data=data, method="POST")
-    req.add_header("Content-Type", "application/json")
-    with urllib.request.urlopen(req, timeout=timeout) as resp:
-        body = resp.read()
-        return json.loads(body.decode("utf-8"))
+# Keep-alive connections keyed by (scheme, host, port) so repeated RPCs reuse
+# one TCP connection instead of paying a fresh handshake per call.
+_CONNECTIONS: dict = {}
+
+def _open_response(url: str, method: str, body: bytes | None = None,
+                   headers: dict | None = None, timeout: float = 5.0):
+    parts = urlsplit(url)
+    key = (parts.scheme, parts.hostname, parts.port)
+    path = parts.path or "/"
+    if parts.query:
+        path += "?" + parts.query
+    for attempt in (0, 1):
+        conn = _CONNECTIONS.get(key)
+        if conn is None:
+            cls = http.client.HTTPSConnection if parts.scheme == "https" else http.client.HTTPConnection
+            conn = cls(parts.hostname, parts.port, timeout=timeout)
+            _CONNECTIONS[key] = conn
+        try:
+            conn.request(method, path, body=body, headers=headers or {})
+            resp = conn.getresponse()
+        except (http.client.BadStatusLine, http.client.RemoteDisconnected, ConnectionError):
+            # Stale keep-alive connection: drop it and retry once on a fresh one.
+            conn.close()
+            _CONNECTIONS.pop(key, None)
+            if attempt:
+                raise
+            continue
+        if resp.status >= 400:
+            resp.read()  # drain so the connection stays reusable
+            raise RuntimeError(f"HTTP {resp.status} {resp.reason} for {url}")
+        return resp
+
+def _http_request(url: str, method: str, body: bytes | None = None,
+                  headers: dict | None = None, timeout: float = 5.0) -> bytes:
+    return _open_response(url, method, body=body, headers=headers, timeout=timeout).read()
+
+def http_post(url: str, payload, timeout: float = 5.0):
+    body = _http_request(url, "POST", body=_dumps(payload),
+                         headers={"Content-Type": "application/json"}, timeout=timeout)
+    return _loads(body)
+
+# Exporter output is repetitive text that compresses ~10x; advertise gzip so
+# remote scrapes move an order of magnitude fewer bytes.
+_GET_HEADERS = {"Accept-Encoding": "gzip"}
 
 def http_get_text(url: str, timeout: float = 5.0) -> str:
-    req = urllib.request.Request(url, method="GET")
-    with urllib.request.urlopen(req, timeout=timeout) as resp:
-        return resp.read().decode("utf-8", errors="replace")
+    resp = _open_response(url, "GET", headers=_GET_HEADERS, timeout=timeout)
+    body = resp.read()
+    if resp.headers.get("Content-Encoding") == "gzip":
+        body = gzip.decompress(body)
+    return body.decode("utf-8", errors="replace")
+
+def http_get_lines(url: str, timeout: float = 5.0):
+    """Yield decoded lines straight off the GET response, one at a time,
+    without materializing the whole body (a Substrate exporter can emit
+    tens of thousands of metric lines)."""
+    resp = _open_response(url, "GET", headers=_GET_HEADERS, timeout=timeout)
+    if resp.headers.get("Content-Encoding") == "gzip":
+        # decompress incrementally so the streaming property is preserved
+        decomp = zlib.decompressobj(16 + zlib.MAX_WBITS)
+        buf = b""
+        while True:
+            chunk = resp.read(65536)
+            if not chunk:
+                break
+            buf += decomp.decompress(chunk)
+            *lines, buf = buf.split(b"\n")
+            for raw in lines:
+                yield raw.decode("utf-8", errors="replace").rstrip("\r")
+        buf += decomp.flush()
+        if buf:
+            yield buf.decode("utf-8", errors="replace").rstrip("\r")
+    else:
+        for raw in resp:
+            yield raw.decode("utf-8", errors="replace").rstrip("\r\n")
 
 def rpc_call(url: str, method: str, params=None, id_=1):
     if params is None:
@@ -53,37 +157,92 @@ def rpc_call(url: str, method: str, params=None, id_=1):
         raise RuntimeError(f"RPC {method} error: {resp['error']}")
     return resp.get("result")
 
+def rpc_batch(url: str, calls: list) -> dict:
+    """
+    Post several JSON-RPC calls as one batch request (single round-trip).
+
+    `calls` is a list of (key, method, params) tuples; returns {key: result},
+    where a failed call maps to a RuntimeError instead of raising, so callers
+    can keep the per-key error reporting style.
+    """
+    payload = [
+        {"jsonrpc": "2.0", "id": i, "method": method, "params": params or []}
+        for i, (_key, method, params) in enumerate(calls)
+    ]
+    responses = http_post(url, payload)
+    by_id = {r.get("id"): r for r in responses if isinstance(r, dict)}
+    out = {}
+    for i, (key, method, _params) in enumerate(calls):
+        resp = by_id.get(i)
+        if resp is None:
+            out[key] = RuntimeError(f"RPC {method}: missing batch response")
+        elif "error" in resp:
+            out[key] = RuntimeError(f"RPC {method} error: {resp['error']}")
+        else:
+            out[key] = resp.get("result")
+    return out
+
 def hex_to_int(h: str) -> int | None:
     if not isinstance(h, str):
         return None
-    h = h.lower()
-    if h.startswith("0x"):
-        return int(h, 16)
     try:
-        return int(h)
-    except Exception:
+        # base 0 auto-detects the 0x prefix; no need to lower-case (Substrate
+        # already returns lowercase hex) or branch on the prefix ourselves
+        return int(h, 0)
+    except ValueError:
         return None
 
-def grab_rpc_snapshot(rpc_url: str) -> dict:
+# These answers never change for the lifetime of a node process, so fetch
+# them once per rpc_url and reuse across snapshots.
+_STATIC_KEYS = ("system_name", "system_version", "system_chain", "peer_id", "properties")
+_STATIC_RPC_CACHE: dict = {}
+
+# Everything in the snapshot that needs no prior data; fetched as one batch.
+_SNAPSHOT_CALLS = [
+    ("system_name",     "system_name", []),
+    ("system_version",  "system_version", []),
+    ("system_chain",    "system_chain", []),
+    ("node_roles",      "system_nodeRoles", []),
+    ("health",          "system_health", []),
+    ("sync_state",      "system_syncState", []),
+    ("peer_id",         "system_localPeerId", []),
+    ("peers",           "system_peers", []),
+    ("best_hash",       "chain_getBlockHash", []),
+    ("finalized_hash",  "chain_getFinalizedHead", []),
+    ("properties",      "system_properties", []),
+]
+
+def _header_calls(first: dict) -> list:
+    """Second-round chain_getHeader calls for whichever head hashes arrived."""
+    calls = []
+    best_hash = first.get("best_hash")
+    fin_hash = first.get("finalized_hash")
+    if best_hash and not isinstance(best_hash, Exception):
+        calls.append(("best_header", "chain_getHeader", [best_hash]))
+    if fin_hash and not isinstance(fin_hash, Exception):
+        calls.append(("finalized_header", "chain_getHeader", [fin_hash]))
+    return calls
+
+def _assemble_snapshot(rpc_url: str, first: dict, headers: dict) -> dict:
+    """Build the snapshot dict from the two batch results (shared between the
+    sync and async fetch paths)."""
     snap = {"rpc_url": rpc_url, "ts": int(time.time())}
 
-    def try_put(key, func):
-        try:
-            snap[key] = func()
-        except Exception as e:
-            snap[f"{key}_error"] = str(e)
+    def put(key, value):
+        if isinstance(value, Exception):
+            snap[f"{key}_error"] = str(value)
+        else:
+            snap[key] = value
 
-    try_put("system_name",      lambda: rpc_call(rpc_url, "system_name"))
-    try_put("system_version",   lambda: rpc_call(rpc_url, "system_version"))
-    try_put("system_chain",     lambda: rpc_call(rpc_url, "system_chain"))
-    try_put("node_roles",       lambda: rpc_call(rpc_url, "system_nodeRoles"))
-    try_put("health",           lambda: rpc_call(rpc_url, "system_health"))
-    try_put("sync_state",       lambda: rpc_call(rpc_url, "system_syncState"))
-    try_put("peer_id",          lambda: rpc_call(rpc_url, "system_localPeerId"))
+    for key in ("system_name", "system_version", "system_chain", "node_roles",
+                "health", "sync_state", "peer_id", "properties"):
+        put(key, first[key])
 
     # Peers (sample only first few)
-    try:
-        peers = rpc_call(rpc_url, "system_peers") or []
+    if isinstance(first["peers"], Exception):
+        snap["peers_error"] = str(first["peers"])
+    else:
+        peers = first["peers"] or []
         snap["peers_count"] = len(peers)
         snap["peers_sample"] = [
             {
@@ -94,67 +253,139 @@ def grab_rpc_snapshot(rpc_url: str) -> dict:
             }
             for p in peers[:3]
         ]
-    except Exception as e:
-        snap["peers_error"] = str(e)
 
     # Best / finalized heads
+    for hash_key, header_key, out_prefix in (
+        ("best_hash", "best_header", "best"),
+        ("finalized_hash", "finalized_header", "finalized"),
+    ):
+        if isinstance(first[hash_key], Exception):
+            snap[f"{out_prefix}_error"] = str(first[hash_key])
+            continue
+        snap[hash_key] = first[hash_key]
+        header = headers.get(header_key)
+        if isinstance(header, Exception):
+            snap[f"{out_prefix}_error"] = str(header)
+            snap[f"{out_prefix}_number"] = None
+        else:
+            snap[f"{out_prefix}_number"] = hex_to_int(header.get("number")) if header else None
+
+    return snap
+
+def _snapshot_calls(rpc_url: str) -> list:
+    """The batch for this snapshot: skip static calls once they're cached."""
+    if rpc_url in _STATIC_RPC_CACHE:
+        return [c for c in _SNAPSHOT_CALLS if c[0] not in _STATIC_KEYS]
+    return _SNAPSHOT_CALLS
+
+def _fold_static(rpc_url: str, first: dict) -> dict:
+    """Merge cached static answers into a batch result, seeding the cache on
+    the first fully-successful snapshot for this rpc_url."""
+    static = _STATIC_RPC_CACHE.get(rpc_url)
+    if static is None:
+        cached = {k: first[k] for k in _STATIC_KEYS if not isinstance(first.get(k), Exception)}
+        if len(cached) == len(_STATIC_KEYS):
+            _STATIC_RPC_CACHE[rpc_url] = cached
+        return first
+    return {**static, **first}
+
+def grab_rpc_snapshot(rpc_url: str) -> dict:
+    calls = _snapshot_calls(rpc_url)
     try:
-        best_hash = rpc_call(rpc_url, "chain_getBlockHash")
-        best_header = rpc_call(rpc_url, "chain_getHeader", [best_hash]) if best_hash else None
-        snap["best_hash"] = best_hash
-        snap["best_number"] = hex_to_int(best_header.get("number")) if best_header else None
+        first = rpc_batch(rpc_url, calls)
     except Exception as e:
-        snap["best_error"] = str(e)
+        # Node unreachable: report the transport error per key, as before.
+        first = {k: e for (k, _m, _p) in calls}
+    first = _fold_static(rpc_url, first)
 
+    header_calls = _header_calls(first)
     try:
-        fin_hash = rpc_call(rpc_url, "chain_getFinalizedHead")
-        fin_header = rpc_call(rpc_url, "chain_getHeader", [fin_hash]) if fin_hash else None
-        snap["finalized_hash"] = fin_hash
-        snap["finalized_number"] = hex_to_int(fin_header.get("number")) if fin_header else None
+        headers = rpc_batch(rpc_url, header_calls) if header_calls else {}
     except Exception as e:
-        snap["finalized_error"] = str(e)
+        headers = {k: e for (k, _m, _p) in header_calls}
 
-    try_put("properties",       lambda: rpc_call(rpc_url, "system_properties"))
-    return snap
+    return _assemble_snapshot(rpc_url, first, headers)
 
-def scrape_metrics(metrics_url: str) -> dict:
-    text = http_get_text(metrics_url)
-    out = {"metrics_url": metrics_url, "raw_sample": None, "parsed": {}}
-    # strip comments/help lines
-    lines = [ln.strip() for ln in text.splitlines() if ln and not ln.startswith("#")]
-    out["raw_sample"] = lines[:20]  # keep a small preview
-
-    def parse_line(ln: str):
-        name = ln.split("{", 1)[0].strip()
-        rest = ln[len(name):].strip()
-        labels = {}
-        valstr = None
-        if rest.startswith("{"):
-            try:
-                label_part, after = rest[1:].split("}", 1)
-                for kv in label_part.split(","):
-                    if "=" in kv:
-                        k, v = kv.split("=", 1)
-                        labels[k.strip()] = v.strip().strip('"')
-                valstr = after.strip()
-            except ValueError:
-                return None
+async def rpc_batch_async(session, url: str, calls: list) -> dict:
+    """aiohttp flavour of rpc_batch; same (key, method, params) -> result dict."""
+    payload = [
+        {"jsonrpc": "2.0", "id": i, "method": method, "params": params or []}
+        for i, (_key, method, params) in enumerate(calls)
+    ]
+    async with session.post(url, json=payload) as resp:
+        responses = await resp.json(content_type=None)
+    by_id = {r.get("id"): r for r in responses if isinstance(r, dict)}
+    out = {}
+    for i, (key, method, _params) in enumerate(calls):
+        r = by_id.get(i)
+        if r is None:
+            out[key] = RuntimeError(f"RPC {method}: missing batch response")
+        elif "error" in r:
+            out[key] = RuntimeError(f"RPC {method} error: {r['error']}")
         else:
-            valstr = rest
-        tok = valstr.split()
+            out[key] = r.get("result")
+    return out
+
+async def grab_rpc_snapshot_async(rpc_url: str, timeout: float = 5.0) -> dict:
+    """Async snapshot for callers already inside an event loop. Requires
+    aiohttp; without it, fall back to the (equally batched) sync path."""
+    if aiohttp is None:
+        return await asyncio.to_thread(grab_rpc_snapshot, rpc_url)
+
+    async with aiohttp.ClientSession(
+        timeout=aiohttp.ClientTimeout(total=timeout)
+    ) as session:
+        calls = _snapshot_calls(rpc_url)
         try:
-            val = float(tok[0])
-        except Exception:
-            return None
-        return name, labels, val
+            first = await rpc_batch_async(session, rpc_url, calls)
+        except Exception as e:
+            first = {k: e for (k, _m, _p) in calls}
+        first = _fold_static(rpc_url, first)
+
+        # The two header lookups are independent; fire them concurrently.
+        header_calls = _header_calls(first)
+        headers = {}
+        if header_calls:
+            results = await asyncio.gather(
+                *(rpc_batch_async(session, rpc_url, [call]) for call in header_calls),
+                return_exceptions=True,
+            )
+            for call, res in zip(header_calls, results):
+                if isinstance(res, Exception):
+                    headers[call[0]] = res
+                else:
+                    headers.update(res)
+
+    return _assemble_snapshot(rpc_url, first, headers)
+
+def scrape_metrics(metrics_url: str) -> dict:
+    out = {"metrics_url": metrics_url, "raw_sample": [], "parsed": {}}
+    raw_sample = out["raw_sample"]  # keep a small preview
 
     parsed = {}
-    for ln in lines:
-        pl = parse_line(ln)
-        if not pl:
+    # stream: filter comments/empties in the same pass as parsing
+    for ln in http_get_lines(metrics_url):
+        ln = ln.strip()
+        if not ln or ln[0] == "#":
+            continue
+        if len(raw_sample) < 20:
+            raw_sample.append(ln)
+        # slice the name out cheaply and short-circuit unwanted metrics
+        # before paying for the regex match and float conversion
+        name = ln.partition("{")[0].partition(" ")[0]
+        if not _wanted_metric(name):
+            continue
+        m = _METRIC_RE.match(ln)
+        if not m:
+            continue
+        name, labelblob, valstr = m.groups()
+        try:
+            val = float(valstr)
+        except ValueError:
             continue
-        name, labels, val = pl
         if name.startswith("substrate_block_height"):
+            # only this branch looks at labels, so only it pays for them
+            labels = dict(_LABEL_RE.findall(labelblob)) if labelblob else {}
             status = labels.get("status", "unknown")
             parsed.setdefault("block_height", {})[status] = val
         elif "sync_peers" in name and "substrate" in name:
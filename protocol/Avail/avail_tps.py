@@ -2,6 +2,19 @@ import requests
 import json
 from datetime import datetime
 
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+# One session for all Subscan calls: reuses the TLS connection across requests
+# (the handshake dominates first-call latency) and retries transient 5xx.
+_SCAN = requests.Session()
+_SCAN.headers.update({'Content-Type': 'application/json'})
+_SCAN.mount("https://", HTTPAdapter(
+    pool_connections=2,
+    pool_maxsize=4,
+    max_retries=Retry(total=3, backoff_factor=0.3, status_forcelist=[502, 503, 504]),
+))
+
 def fetch_block_info(page=0, row=1000):
     """
     Fetches block information from Avail using Subscan API.
@@ -13,11 +26,6 @@ def fetch_block_info(page=0, row=1000):
     # API Endpoint for block information
     API_URL = "https://avail.api.subscan.io/api/v2/scan/blocks"
 
-    # Request Headers
-    headers = {
-        'Content-Type': 'application/json',
-    }
-
     # Request Body
     payload = {
         "page": page,
@@ -26,148 +34,102 @@ def fetch_block_info(page=0, row=1000):
     }
 
     try:
-        response = requests.post(API_URL, headers=headers, json=payload)
+        response = _SCAN.post(API_URL, json=payload)
         response.raise_for_status()
         data = response.json()
 
         if data.get('code') == 0:
             blocks = data.get('data', {}).get('blocks', [])
             total = data.get('data', {}).get('count', 0)
-            
+
             print(f"\nFetched {len(blocks)} blocks out of {total} total blocks")
-            
-            total_data_size = 0
-            total_data_count = 0
-            
-            # Process each block
-            for block in blocks:
-                block_num = block.get('block_num')
-                timestamp = datetime.fromtimestamp(block.get('block_timestamp'))
-                extrinsics = block.get('extrinsics_count', 0)
-                additional_meta = block.get('additional_meta', {})
-                
-                # Extract data submission metrics
-                data_count = additional_meta.get('submit_data_count', 0)
-                data_size = additional_meta.get('submit_data_size', 0)
-                
-                # Update totals
-                total_data_size += data_size
-                total_data_count += data_count
-                
-                # Additional block details if needed
-
-                # print(f"\nBlock #{block_num}")
-                # print(f"Timestamp: {timestamp}")
-                # print(f"Extrinsics count: {extrinsics}")
-                # print(f"Data submissions: {data_count}")
-                # print(f"Data size: {data_size/1024:.2f} KB")
-                # print(f"Block hash: {block.get('hash')}")
-                # print("-" * 50)
+
+            # Aggregate everything downstream needs in this one pass so the
+            # TPS/data-rate code doesn't re-walk the block list.
+            total_extrinsics, total_data_size, total_data_count = _aggregate_blocks(blocks)
 
             # Calculate averages
             avg_data_size = total_data_size / len(blocks) if blocks else 0
             avg_data_count = total_data_count / len(blocks) if blocks else 0
-            
+
             print("\nSummary Statistics:")
             print(f"Total data size: {total_data_size/1024/1024:.2f} MB")
             print(f"Total data submissions: {total_data_count}")
             print(f"Average data size per block: {avg_data_size/1024:.2f} KB")
             print(f"Average submissions per block: {avg_data_count:.2f}")
 
-            return blocks
-        
+            return {
+                'blocks': blocks,
+                'total_extrinsics': total_extrinsics,
+                'total_data_size': total_data_size,
+                'total_data_count': total_data_count,
+                # blocks arrive newest-first
+                'first_ts': blocks[-1].get('block_timestamp') if blocks else 0,
+                'last_ts': blocks[0].get('block_timestamp') if blocks else 0,
+            }
+
         else:
             return f"API Error: {data.get('message', 'Unknown error')}"
 
     except requests.exceptions.RequestException as e:
         return f"Request failed: {str(e)}"
     
-def calculate_tps(blocks):
-                """
-                Calculate TPS from block data
-                """
-                if not blocks:
-                    return 0
-                
-                # Get first and last block timestamps
-                first_block = blocks[-1]  # Since blocks are in desc order
-                last_block = blocks[0]
-                
-                start_time = first_block.get('block_timestamp')
-                end_time = last_block.get('block_timestamp')
-                
-                # Calculate time difference
-                time_diff = end_time - start_time
-                if time_diff <= 0:
-                    return 0
-                
-                # Sum all extrinsics
-                total_extrinsics = sum(block.get('extrinsics_count', 0) for block in blocks)
-                
-                # Calculate TPS
-                tps = total_extrinsics / time_diff
-                return tps
+# Shared empty-meta sentinel: avoids allocating a fresh {} default for every
+# block whose additional_meta is missing.
+_EMPTY_META = {}
 
-import requests
-from datetime import datetime
+def _aggregate_blocks(blocks):
+    """
+    Single pass over blocks collecting every total the TPS/data-rate
+    calculations need, instead of one sum() traversal per metric.
+    Returns (total_extrinsics, total_data_size, total_data_count).
+    """
+    total_extrinsics = 0
+    total_data_size = 0
+    total_data_count = 0
+    for block in blocks:
+        total_extrinsics += block.get('extrinsics_count', 0) or 0
+        meta = block.get('additional_meta') or _EMPTY_META
+        total_data_size += meta.get('submit_data_size', 0) or 0
+        total_data_count += meta.get('submit_data_count', 0) or 0
+    return total_extrinsics, total_data_size, total_data_count
+
+def calculate_tps(agg):
+    """
+    Calculate TPS from the aggregates fetch_block_info already computed
+    """
+    if not agg or not agg.get('blocks'):
+        return 0
+
+    time_diff = agg['last_ts'] - agg['first_ts']
+    if time_diff <= 0:
+        return 0
+
+    return agg['total_extrinsics'] / time_diff
 
 def fetch_tps_data():
     """
     Fetch TPS data from Avail using Subscan API
     """
-    blocks = fetch_block_info(page=0, row=100)
-    tps = 0
-    if isinstance(blocks, list):
-        # Calculate TPS
-        tps = calculate_tps(blocks)
-        
+    result = fetch_block_info(page=0, row=100)
+    if isinstance(result, dict):
+        # fetch_block_info aggregated everything in its single pass
+        tps = calculate_tps(result)
+
         print("\nTPS Analysis:")
         print(f"Transactions Per Second: {tps:.2f}")
-        print(f"Sample Period: {len(blocks)} blocks")
-        
-        # Calculate data submission rate
-        first_time = blocks[-1].get('block_timestamp')
-        last_time = blocks[0].get('block_timestamp')
-        time_period = last_time - first_time
-        
+        print(f"Sample Period: {len(result['blocks'])} blocks")
+
+        time_period = result['last_ts'] - result['first_ts']
         if time_period > 0:
-            data_rate = sum(
-                block.get('additional_meta', {}).get('submit_data_size', 0) 
-                for block in blocks
-            ) / time_period / 1024  # KB/s
-            
+            data_rate = result['total_data_size'] / time_period / 1024  # KB/s
             print(f"Data Submission Rate: {data_rate:.2f} KB/s")
-        
+
         return tps
 
     else:
-        print(f"Error: {blocks}")
+        print(f"Error: {result}")
         return 0.0
 
 if __name__ == "__main__":
-    blocks = fetch_block_info(page=0, row=100)
-    tps = 0
-    if isinstance(blocks, list):
-        # Calculate TPS
-        tps = calculate_tps(blocks)
-        
-        print("\nTPS Analysis:")
-        print(f"Transactions Per Second: {tps:.2f}")
-        print(f"Sample Period: {len(blocks)} blocks")
-        
-        # Calculate data submission rate
-        first_time = blocks[-1].get('block_timestamp')
-        last_time = blocks[0].get('block_timestamp')
-        time_period = last_time - first_time
-        
-        if time_period > 0:
-            data_rate = sum(
-                block.get('additional_meta', {}).get('submit_data_size', 0) 
-                for block in blocks
-            ) / time_period / 1024  # KB/s
-            
-            print(f"Data Submission Rate: {data_rate:.2f} KB/s")
-        
-
-    else:
-        print(f"Error: {blocks}")
\ No newline at end of file
+    fetch_tps_data()
\ No newline at end of file
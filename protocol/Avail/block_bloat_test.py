@@ -18,19 +18,67 @@ Examples:
 """
 
 import argparse
+import http.client
 import json
 import time
-import urllib.request
-import urllib.error
+from urllib.parse import urlsplit
 
 from typing import Optional, Tuple, List
 
+# orjson parses/encodes several times faster and works on bytes directly —
+# relevant here because chain_getBlock on a bloated block is multi-MB JSON.
+# stdlib json is the fallback.
+try:
+    import orjson
+    _loads = orjson.loads
+    def _dumps(obj) -> bytes:
+        return orjson.dumps(obj)
+except ImportError:
+    _loads = json.loads
+    def _dumps(obj) -> bytes:
+        return json.dumps(obj).encode("utf-8")
+
 # ------------- RPC helpers (no extra deps) -------------
-def http_post(url: str, payload: dict, timeout: float = 10.0) -> dict:
-    data = json.dumps(payload).encode("utf-8")
-    req = urllib.request.Request(url, data=data, method="POST", headers={"Content-Type": "application/json"})
-    with urllib.request.urlopen(req, timeout=timeout) as resp:
-        return json.loads(resp.read().decode("utf-8"))
+# Keep-alive connections keyed by (scheme, host, port) so every RPC to the node
+# reuses one TCP connection instead of paying a handshake per call.
+_CONNECTIONS: dict = {}
+
+def _open_response(url: str, method: str, body: Optional[bytes] = None,
+                   headers: Optional[dict] = None, timeout: float = 10.0):
+    parts = urlsplit(url)
+    key = (parts.scheme, parts.hostname, parts.port)
+    path = parts.path or "/"
+    if parts.query:
+        path += "?" + parts.query
+    for attempt in (0, 1):
+        conn = _CONNECTIONS.get(key)
+        if conn is None:
+            cls = http.client.HTTPSConnection if parts.scheme == "https" else http.client.HTTPConnection
+            conn = cls(parts.hostname, parts.port, timeout=timeout)
+            _CONNECTIONS[key] = conn
+        try:
+            conn.request(method, path, body=body, headers=headers or {})
+            resp = conn.getresponse()
+        except (http.client.BadStatusLine, http.client.RemoteDisconnected, ConnectionError):
+            # Stale keep-alive connection: drop it and retry once on a fresh one.
+            conn.close()
+            _CONNECTIONS.pop(key, None)
+            if attempt:
+                raise
+            continue
+        if resp.status >= 400:
+            resp.read()  # drain so the connection stays reusable
+            raise RuntimeError(f"HTTP {resp.status} {resp.reason} for {url}")
+        return resp
+
+def _http_request(url: str, method: str, body: Optional[bytes] = None,
+                  headers: Optional[dict] = None, timeout: float = 10.0) -> bytes:
+    return _open_response(url, method, body=body, headers=headers, timeout=timeout).read()
+
+def http_post(url: str, payload, timeout: float = 10.0):
+    body = _http_request(url, "POST", body=_dumps(payload),
+                         headers={"Content-Type": "application/json"}, timeout=timeout)
+    return _loads(body)
 
 def rpc_call(url: str, method: str, params=None, id_=1):
     if params is None:
@@ -40,56 +88,199 @@ def rpc_call(url: str, method: str, params=None, id_=1):
         raise RuntimeError(f"RPC {method} error: {resp['error']}")
     return resp["result"]
 
+def rpc_batch(url: str, calls: List[Tuple[str, str, list]]) -> dict:
+    """One POST carrying a JSON-RPC batch; returns {key: result-or-RuntimeError}."""
+    payload = [
+        {"jsonrpc": "2.0", "id": i, "method": method, "params": params or []}
+        for i, (_key, method, params) in enumerate(calls)
+    ]
+    responses = http_post(url, payload)
+    by_id = {r.get("id"): r for r in responses if isinstance(r, dict)}
+    out = {}
+    for i, (key, method, _params) in enumerate(calls):
+        resp = by_id.get(i)
+        if resp is None:
+            out[key] = RuntimeError(f"RPC {method}: missing batch response")
+        elif "error" in resp:
+            out[key] = RuntimeError(f"RPC {method} error: {resp['error']}")
+        else:
+            out[key] = resp.get("result")
+    return out
+
 def hex_to_int(h: Optional[str]) -> Optional[int]:
     if not isinstance(h, str):
         return None
-    if h.startswith("0x"):
-        return int(h, 16)
     try:
-        return int(h)
-    except Exception:
+        return int(h, 0)  # base 0 auto-detects the 0x prefix
+    except ValueError:
         return None
 
+# Static per-node-process answers, cached by rpc_url: the BEFORE snapshot pays
+# for them once and the AFTER snapshot reuses them.
+_STATIC_KEYS = ("system_name", "system_version", "system_chain", "peer_id")
+_STATIC_RPC_CACHE: dict = {}
+
+_TELEMETRY_CALLS = [
+    ("system_name",     "system_name", []),
+    ("system_version",  "system_version", []),
+    ("system_chain",    "system_chain", []),
+    ("health",          "system_health", []),
+    ("sync_state",      "system_syncState", []),
+    ("peer_id",         "system_localPeerId", []),
+    ("best_hash",       "chain_getBlockHash", []),
+    ("finalized_hash",  "chain_getFinalizedHead", []),
+]
+
 def telemetry_snapshot(rpc_url: str) -> dict:
     snap = {"ts": int(time.time())}
-    def put(k, fn):
-        try:
-            snap[k] = fn()
-        except Exception as e:
-            snap[k+"_error"] = str(e)
+    def put(k, value):
+        if isinstance(value, Exception):
+            snap[k+"_error"] = str(value)
+        else:
+            snap[k] = value
 
-    put("system_name",      lambda: rpc_call(rpc_url, "system_name"))
-    put("system_version",   lambda: rpc_call(rpc_url, "system_version"))
-    put("system_chain",     lambda: rpc_call(rpc_url, "system_chain"))
-    put("health",           lambda: rpc_call(rpc_url, "system_health"))
-    put("sync_state",       lambda: rpc_call(rpc_url, "system_syncState"))
-    put("peer_id",          lambda: rpc_call(rpc_url, "system_localPeerId"))
+    # One round-trip for everything independent, then one more for the headers.
+    static = _STATIC_RPC_CACHE.get(rpc_url)
+    keys = _TELEMETRY_CALLS if static is None else [
+        c for c in _TELEMETRY_CALLS if c[0] not in _STATIC_KEYS
+    ]
+    try:
+        first = rpc_batch(rpc_url, keys)
+    except Exception as e:
+        # Node unreachable: report the transport error per key, as before.
+        first = {k: e for (k, _m, _p) in keys}
+
+    if static is None:
+        cached = {k: first[k] for k in _STATIC_KEYS if not isinstance(first.get(k), Exception)}
+        if len(cached) == len(_STATIC_KEYS):
+            _STATIC_RPC_CACHE[rpc_url] = cached
+    else:
+        first = {**static, **first}
+
+    for key in ("system_name", "system_version", "system_chain",
+                "health", "sync_state", "peer_id"):
+        put(key, first[key])
 
     # heads
+    best_hash = None if isinstance(first["best_hash"], Exception) else first["best_hash"]
+    fin_hash = None if isinstance(first["finalized_hash"], Exception) else first["finalized_hash"]
+    header_calls = []
+    if best_hash:
+        header_calls.append(("best_header", "chain_getHeader", [best_hash]))
+    if fin_hash:
+        header_calls.append(("finalized_header", "chain_getHeader", [fin_hash]))
     try:
-        best_hash = rpc_call(rpc_url, "chain_getBlockHash")
-        best_header = rpc_call(rpc_url, "chain_getHeader", [best_hash]) if best_hash else None
-        snap["best_hash"] = best_hash
-        snap["best_number"] = hex_to_int(best_header.get("number")) if best_header else None
+        headers = rpc_batch(rpc_url, header_calls) if header_calls else {}
     except Exception as e:
-        snap["best_error"] = str(e)
+        headers = {k: e for (k, _m, _p) in header_calls}
 
-    try:
-        fin_hash = rpc_call(rpc_url, "chain_getFinalizedHead")
-        fin_header = rpc_call(rpc_url, "chain_getHeader", [fin_hash]) if fin_hash else None
+    if isinstance(first["best_hash"], Exception):
+        snap["best_error"] = str(first["best_hash"])
+    else:
+        snap["best_hash"] = best_hash
+        best_header = headers.get("best_header")
+        if isinstance(best_header, Exception):
+            snap["best_error"] = str(best_header)
+            snap["best_number"] = None
+        else:
+            snap["best_number"] = hex_to_int(best_header.get("number")) if best_header else None
+
+    if isinstance(first["finalized_hash"], Exception):
+        snap["finalized_error"] = str(first["finalized_hash"])
+    else:
         snap["finalized_hash"] = fin_hash
-        snap["finalized_number"] = hex_to_int(fin_header.get("number")) if fin_header else None
-    except Exception as e:
-        snap["finalized_error"] = str(e)
+        fin_header = headers.get("finalized_header")
+        if isinstance(fin_header, Exception):
+            snap["finalized_error"] = str(fin_header)
+            snap["finalized_number"] = None
+        else:
+            snap["finalized_number"] = hex_to_int(fin_header.get("number")) if fin_header else None
 
     return snap
 
+def _streaming_block_extrinsics_bytes(rpc_url: str, block_hash: str, timeout: float = 30.0) -> int:
+    """
+    Sum extrinsic hex lengths straight off the chain_getBlock byte stream.
+
+    A bloated block comes back as multi-MB JSON where almost all bytes are the
+    extrinsic hex strings; json.loads would materialize every one of them as a
+    Python str just so we can take len(). Instead scan the raw response for the
+    "extrinsics" array and count bytes inside its string elements (hex strings
+    contain no JSON escapes, so quote-scanning is safe).
+    """
+    payload = _dumps({"jsonrpc": "2.0", "id": 1, "method": "chain_getBlock",
+                      "params": [block_hash]})
+    resp = _open_response(rpc_url, "POST", body=payload,
+                          headers={"Content-Type": "application/json"}, timeout=timeout)
+
+    marker = b'"extrinsics":'
+    total_hex_chars = 0
+    # 0 = hunting for marker, 1 = hunting for '[', 2 = between array strings,
+    # 3 = inside a string element
+    state = 0
+    tail = b""
+    str_len = 0
+    prefix = b""
+    done = False
+    while True:
+        chunk = resp.read(65536)
+        if not chunk:
+            break
+        if done:
+            continue  # drain the rest so the keep-alive connection stays clean
+        buf = tail + chunk if state == 0 else chunk
+        i = 0
+        if state == 0:
+            idx = buf.find(marker)
+            if idx == -1:
+                tail = buf[-(len(marker) - 1):]
+                continue
+            tail = b""
+            state = 1
+            i = idx + len(marker)
+        n = len(buf)
+        while i < n and not done:
+            c = buf[i]
+            if state == 1:
+                if c == 0x5B:  # '['
+                    state = 2
+                i += 1
+            elif state == 2:
+                if c == 0x22:  # '"'
+                    state = 3
+                    str_len = 0
+                    prefix = b""
+                elif c == 0x5D:  # ']' closes the extrinsics array
+                    done = True
+                i += 1
+            else:  # state == 3
+                end = buf.find(b'"', i)
+                seg = buf[i:] if end == -1 else buf[i:end]
+                if len(prefix) < 2:
+                    prefix += seg[:2 - len(prefix)]
+                str_len += len(seg)
+                if end == -1:
+                    i = n
+                else:
+                    if prefix == b"0x":
+                        total_hex_chars += str_len - 2
+                    state = 2
+                    i = end + 1
+
+    if not done:
+        raise ValueError("extrinsics array not found in chain_getBlock response")
+    return total_hex_chars // 2
+
 def block_extrinsics_size_bytes(rpc_url: str, block_hash: str) -> int:
     """Approximate extrinsics bytes by summing hex lengths of each extrinsic in the block."""
-    blk = rpc_call(rpc_url, "chain_getBlock", [block_hash])
-    exs = blk["block"]["extrinsics"]
-    total_hex_chars = sum(len(x) - 2 for x in exs if isinstance(x, str) and x.startswith("0x"))
-    return total_hex_chars // 2
+    try:
+        return _streaming_block_extrinsics_bytes(rpc_url, block_hash)
+    except Exception:
+        # fall back to the full JSON decode
+        blk = rpc_call(rpc_url, "chain_getBlock", [block_hash])
+        exs = blk["block"]["extrinsics"]
+        total_hex_chars = sum(len(x) - 2 for x in exs if isinstance(x, str) and x.startswith("0x"))
+        return total_hex_chars // 2
 
 # ------------- Bloater (py-substrate-interface) -------------
 def bloat_block(
@@ -107,34 +298,45 @@ def bloat_block(
     from substrateinterface import SubstrateInterface, Keypair
     from substrateinterface.exceptions import SubstrateRequestException
 
-    # Connect
+    # Connect. No type_registry_preset: the node-template registry merge costs
+    # a noticeable chunk of every cold start and nothing here relies on it.
     substrate = SubstrateInterface(
         url=rpc_url,
         ss58_format=42,                # generic; doesn't matter for //Alice dev
-        type_registry_preset='substrate-node-template'  # generic types
     )
+    # Fetch and decode the runtime metadata once, up front: compose_call would
+    # trigger init_runtime() lazily anyway, and doing it here keeps the
+    # submit/auto-tune loop free of the state_getMetadata fetch + SCALE decode.
+    try:
+        substrate.init_runtime()
+    except Exception as e:
+        print(f"init_runtime failed ({e}); metadata will load lazily")
     keypair = Keypair.create_from_uri(seed_uri)
 
     # Build one remark call; pick remark_with_event if available, else remark.
-    remark_data = bytes([0x42]) * chunk_bytes
-    def make_remark_call():
-        try:
-            return substrate.compose_call(
-                call_module='System', call_function='remark_with_event', call_params={'remark': remark_data}
-            )
-        except Exception:
-            return substrate.compose_call(
-                call_module='System', call_function='remark', call_params={'remark': remark_data}
-            )
+    # Every copy in the batch is identical, so compose (metadata lookup + SCALE
+    # encode) exactly once and reuse the immutable call object N times.
+    remark_data = b"\x42" * chunk_bytes  # single allocation, no 1-byte temp
+    try:
+        remark_call = substrate.compose_call(
+            call_module='System', call_function='remark_with_event', call_params={'remark': remark_data}
+        )
+    except Exception:
+        remark_call = substrate.compose_call(
+            call_module='System', call_function='remark', call_params={'remark': remark_data}
+        )
+
+    # Resolve Utility.batch vs batch_all once instead of try/except per attempt.
+    try:
+        batch_function = 'batch' if substrate.get_metadata_call_function('Utility', 'batch') else 'batch_all'
+    except Exception:
+        batch_function = 'batch_all'
 
     # Compose a batch from N remarks
     def make_batch(n):
-        calls = [make_remark_call() for _ in range(n)]
-        try:
-            return substrate.compose_call(call_module='Utility', call_function='batch', call_params={'calls': calls})
-        except Exception:
-            # Fallback to batch_all
-            return substrate.compose_call(call_module='Utility', call_function='batch_all', call_params={'calls': calls})
+        return substrate.compose_call(
+            call_module='Utility', call_function=batch_function, call_params={'calls': [remark_call] * n}
+        )
 
     # Try to submit with N, return (True, receipt) if included/finalized; else (False, reason)
     def try_submit(n):
@@ -153,34 +355,38 @@ def bloat_block(
         except Exception as e:
             return False, str(e)
 
-    # Auto-tune N: start from start_calls, back off by half until success, then try to grow (optional simple binary-ish search)
-    low, high = 1, max(1, min(max_calls, start_calls))
+    # Auto-tune N: halve from start_calls until something fits, remembering the
+    # smallest size that failed along the way.
+    n = max(1, min(max_calls, start_calls))
+    last_failed = None
     ok_receipt = None
-    # Decrease until success
-    n = high
     while n >= 1:
         ok, res = try_submit(n)
         if ok:
             ok_receipt = res
             break
         # too big, back off
+        last_failed = n
         n //= 2
         time.sleep(0.5)
 
     if ok_receipt is None:
         raise RuntimeError("Could not find a batch size that fits; try smaller --chunk-bytes or lower --start-calls.")
 
-    # Optional: small ramp up to see if we can pack a bit more (greedy +10%)
+    # Binary search between the last success and the smallest known failure
+    # (or max_calls if start_calls fit outright). Each submission costs about
+    # a block time, so O(log(range)) attempts beat the old +10% greedy ramp.
     best_n = n
     best_receipt = ok_receipt
-    probe = min(max_calls, int(n * 1.1) + 1)
-    while probe > best_n and probe <= max_calls:
-        ok, res = try_submit(probe)
+    lo, hi = n, min(max_calls, (last_failed - 1) if last_failed is not None else max_calls)
+    while lo < hi:
+        mid = (lo + hi + 1) // 2
+        ok, res = try_submit(mid)
         if ok:
-            best_n, best_receipt = probe, res
-            probe = min(max_calls, int(probe * 1.1) + 1)
+            best_n, best_receipt = mid, res
+            lo = mid
         else:
-            break
+            hi = mid - 1
 
     # Pull the block hash carrying the extrinsic
     block_hash = best_receipt.block_hash
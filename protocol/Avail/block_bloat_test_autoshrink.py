@@ -1,63 +1,151 @@
 #!/usr/bin/env python3
-import argparse, time, json, math, binascii
+import argparse, time, json
+from functools import lru_cache
 from typing import Optional
-from substrateinterface import SubstrateInterface, Keypair
+try:
+    import numpy as np
+except ImportError:
+    np = None
+from substrateinterface import SubstrateInterface, Keypair, ExtrinsicReceipt
 try:
     from substrateinterface.exceptions import SubstrateRequestException
 except Exception:
     class SubstrateRequestException(Exception): ...
+# websocket-client is a hard dependency of substrate-interface
+from websocket import WebSocketTimeoutException
 
 # ----------------- helpers -----------------
 def hex_to_int(h: Optional[str]) -> Optional[int]:
     if not isinstance(h, str):
         return None
     try:
-        return int(h, 16) if h.startswith("0x") else int(h)
+        if h.startswith("0x"):
+            # bytes.fromhex + int.from_bytes stays on the C big-int path,
+            # skipping int()'s base-16 string parsing; fromhex needs an even
+            # digit count, so pad the minimal hex the node returns
+            hh = h[2:]
+            if len(hh) & 1:
+                hh = "0" + hh
+            return int.from_bytes(bytes.fromhex(hh), "big")
+        return int(h)
     except Exception:
         return None
 
 def rpc(sub: SubstrateInterface, method: str, params=None):
     return sub.rpc_request(method, params or []).get("result")
 
-def telemetry(sub: SubstrateInterface) -> dict:
-    t = {"ts": int(time.time())}
-    def put(key, method, params=None):
-        try: t[key] = rpc(sub, method, params)
-        except Exception as e: t[f"{key}_error"] = str(e)
-
-    put("system_name", "system_name")
-    put("system_version", "system_version")
-    put("system_chain", "system_chain")
-    put("health", "system_health")
-    put("sync_state", "system_syncState")
-    put("peer_id", "system_localPeerId")
+def rpc_batch(sub: SubstrateInterface, calls):
+    """
+    Send several RPCs as one JSON-RPC 2.0 batch frame over the node websocket
+    and demultiplex the replies by id — one round-trip instead of one per
+    call. calls is [(key, method, params)]; returns {key: result-or-Exception}.
+    String ids keep the batch out of the library's integer id space; replies
+    that aren't ours (stray subscription pushes) are ignored. Falls back to
+    sequential rpc_request on non-websocket endpoints.
+    """
+    out = {}
+    ws = getattr(sub, "websocket", None)
+    if ws is None:
+        for key, method, params in calls:
+            try:
+                out[key] = rpc(sub, method, params)
+            except Exception as e:
+                out[key] = e
+        return out
 
+    ids = {f"batch-{i}": key for i, (key, _m, _p) in enumerate(calls)}
+    frame = [
+        {"jsonrpc": "2.0", "id": rid, "method": m, "params": p or []}
+        for rid, (_k, m, p) in zip(ids, calls)
+    ]
     try:
-        best_hash = rpc(sub, "chain_getBlockHash")
-        hdr = rpc(sub, "chain_getHeader", [best_hash]) if best_hash else None
-        t["best_hash"] = best_hash
-        t["best_number"] = hex_to_int(hdr.get("number")) if hdr else None
+        ws.send(json.dumps(frame))
+        pending = set(ids)
+        while pending:
+            reply = json.loads(ws.recv())
+            for msg in (reply if isinstance(reply, list) else [reply]):
+                rid = msg.get("id")
+                if rid not in ids:
+                    continue
+                pending.discard(rid)
+                if "error" in msg:
+                    err = msg["error"]
+                    out[ids[rid]] = RuntimeError(err.get("message", str(err)) if isinstance(err, dict) else str(err))
+                else:
+                    out[ids[rid]] = msg.get("result")
     except Exception as e:
-        t["best_error"] = str(e)
+        for key, _m, _p in calls:
+            out.setdefault(key, e)
+    return out
 
-    try:
-        fin_hash = rpc(sub, "chain_getFinalizedHead")
-        fhdr = rpc(sub, "chain_getHeader", [fin_hash]) if fin_hash else None
-        t["finalized_hash"] = fin_hash
-        t["finalized_number"] = hex_to_int(fhdr.get("number")) if fhdr else None
-    except Exception as e:
-        t["finalized_error"] = str(e)
+# independent telemetry RPCs, sent as a single batch frame
+_TELEMETRY_CALLS = [
+    ("system_name", "system_name", []),
+    ("system_version", "system_version", []),
+    ("system_chain", "system_chain", []),
+    ("health", "system_health", []),
+    ("sync_state", "system_syncState", []),
+    ("peer_id", "system_localPeerId", []),
+    ("best_hash", "chain_getBlockHash", []),
+    ("finalized_hash", "chain_getFinalizedHead", []),
+]
+
+def telemetry(sub: SubstrateInterface) -> dict:
+    # Two round-trips instead of ~10: every independent call goes in one
+    # batch, then the two header lookups (which need the hashes from the
+    # first round) go in a second.
+    t = {"ts": int(time.time())}
+    first = rpc_batch(sub, _TELEMETRY_CALLS)
+    for key, _m, _p in _TELEMETRY_CALLS:
+        v = first.get(key)
+        if isinstance(v, Exception):
+            t[f"{key}_error"] = str(v)
+        else:
+            t[key] = v
+
+    header_calls = [
+        (f"{tag}_header", "chain_getHeader", [first[f"{tag}_hash"]])
+        for tag in ("best", "finalized")
+        if isinstance(first.get(f"{tag}_hash"), str)
+    ]
+    headers = rpc_batch(sub, header_calls) if header_calls else {}
+    for tag in ("best", "finalized"):
+        hdr = headers.get(f"{tag}_header")
+        if isinstance(hdr, Exception):
+            t[f"{tag}_error"] = str(hdr)
+        elif isinstance(hdr, dict):
+            t[f"{tag}_number"] = hex_to_int(hdr.get("number"))
 
     return t
 
 def approx_block_extrinsics_bytes(sub: SubstrateInterface, block_hash: str) -> int:
     blk = rpc(sub, "chain_getBlock", [block_hash])
     exs = blk["block"]["extrinsics"]
-    total_hex_chars = sum(len(x)-2 for x in exs if isinstance(x, str) and x.startswith("0x"))
-    return total_hex_chars // 2
+    # every extrinsic is a "0x..." hex string, so instead of per-item
+    # arithmetic in a Python generator, do one C-level sum of the lengths and
+    # subtract the 2-char prefixes in bulk: bytes = (chars - 2*n) // 2
+    return (sum(map(len, exs)) - 2 * len(exs)) // 2
 
+@lru_cache(maxsize=None)
 def deterministic_payload(n_bytes: int) -> bytes:
-    # deterministic pseudo-random bytes (no os.urandom needed)
+    # deterministic pseudo-random bytes (no os.urandom needed); memoized since
+    # the autoshrink search asks for the same sizes repeatedly
+    if np is not None and n_bytes > 1:
+        # Vectorized LCG via jump-ahead doubling: the first `filled` states
+        # advanced by `filled` steps give the next `filled` states, where the
+        # k-step jump is x -> a^k*x + c*(a^k-1)/(a-1) (mod 2^32) and (A, C)
+        # compose as (A*A, A*C + C). log2(n) array passes instead of a Python
+        # tick per byte; output is bit-identical to the scalar loop below.
+        x = np.empty(n_bytes, dtype=np.uint64)
+        x[0] = (0x42 * 1664525 + 1013904223) & 0xFFFFFFFF
+        A, C = 1664525, 1013904223
+        filled = 1
+        while filled < n_bytes:
+            m = min(filled, n_bytes - filled)
+            x[filled:filled + m] = (x[:m] * A + C) & 0xFFFFFFFF
+            filled += m
+            A, C = (A * A) & 0xFFFFFFFF, (A * C + C) & 0xFFFFFFFF
+        return ((x >> 24) & 0xFF).astype(np.uint8).tobytes()
     data = bytearray(n_bytes)
     x = 0x42
     for i in range(n_bytes):
@@ -66,6 +154,42 @@ def deterministic_payload(n_bytes: int) -> bytes:
     return bytes(data)
 
 # ----------------- core: submit a batch -----------------
+# Composed inner calls keyed by payload size. The autoshrink search probes the
+# same size many times (ramp + bisection), and within one batch every call is
+# identical, so the metadata lookup + SCALE encoding runs once per size rather
+# than n_calls times per probe. The composed call is never mutated after
+# creation, so sharing one object across the batch list is safe.
+_COMPOSED_CACHE = {}
+
+def _composed_call(sub: SubstrateInterface, payload_size: int):
+    """Return (call, using_da) for one data-carrying extrinsic of payload_size bytes."""
+    cached = _COMPOSED_CACHE.get(payload_size)
+    if cached is not None:
+        return cached
+    data = deterministic_payload(payload_size)
+    try:
+        call = sub.compose_call('DataAvailability', 'submit_data', {'data': data})
+        using_da = True
+    except Exception:
+        # fallback: System.remark — the SCALE Bytes codec takes bytes
+        # directly, so skip the 2x hex-string blow-up hexlify produced
+        call = sub.compose_call('System', 'remark', {'remark': data})
+        using_da = False
+    _COMPOSED_CACHE[payload_size] = (call, using_da)
+    return call, using_da
+
+# Locally tracked next nonce per signer: the search submits many extrinsics
+# from one keypair in sequence, so after the initial fetch the nonce is known
+# without an RPC per probe. Dropped on any uncertain outcome to force a
+# re-sync from the node.
+_NONCE_STATE = {}
+
+def _next_nonce(sub: SubstrateInterface, kp: Keypair) -> int:
+    n = _NONCE_STATE.get(kp.ss58_address)
+    if n is None:
+        n = sub.get_account_nonce(kp.ss58_address)
+    return n
+
 def submit_batch(sub: SubstrateInterface, kp: Keypair, payload_size: int, n_calls: int, app_id: int, wait_finalized: bool):
     """
     Compose n_calls of a data-carrying extrinsic and send in Utility.batch.
@@ -73,26 +197,8 @@ def submit_batch(sub: SubstrateInterface, kp: Keypair, payload_size: int, n_call
     - If that call isn't available, fall back to System.remark.
     Returns (ok, info, receipt_or_none)
     """
-    data = deterministic_payload(payload_size)
-
-    # Try DA pallet call; if unavailable, fall back to remark
-    calls = []
-    try:
-        # probe once to see if pallet exists
-        probe = sub.compose_call('DataAvailability', 'submit_data', {'data': data})
-        calls = [probe] + [
-            sub.compose_call('DataAvailability', 'submit_data', {'data': data})
-            for _ in range(n_calls - 1)
-        ]
-        using_da = True
-    except Exception:
-        # fallback: System.remark with hex data
-        remark_hex = "0x" + binascii.hexlify(data).decode()
-        calls = [
-            sub.compose_call('System', 'remark', {'remark': remark_hex})
-            for _ in range(n_calls)
-        ]
-        using_da = False
+    inner, using_da = _composed_call(sub, payload_size)
+    calls = [inner] * n_calls
 
     batch_call = None
     try:
@@ -100,7 +206,7 @@ def submit_batch(sub: SubstrateInterface, kp: Keypair, payload_size: int, n_call
     except Exception:
         batch_call = sub.compose_call('Utility', 'batch_all', {'calls': calls})
 
-    nonce = sub.get_account_nonce(kp.ss58_address)
+    nonce = _next_nonce(sub, kp)
 
     try:
         xt = sub.create_signed_extrinsic(
@@ -115,63 +221,146 @@ def submit_batch(sub: SubstrateInterface, kp: Keypair, payload_size: int, n_call
 
     try:
         # Wait for inclusion (fast), not finalization (slower)
-        receipt = sub.submit_extrinsic(
-            xt, wait_for_inclusion=True, wait_for_finalization=wait_finalized
-        )
+        receipt, err = _submit_and_watch(sub, xt, wait_finalized)
+        if receipt is None:
+            # timeout/dropped/invalid: inclusion unknown, re-sync next probe
+            _NONCE_STATE.pop(kp.ss58_address, None)
+            return False, err, None
+        # included (even with a DispatchError) => the nonce was consumed
+        _NONCE_STATE[kp.ss58_address] = nonce + 1
         if getattr(receipt, "is_success", False):
             return True, f"ok (using {'DA' if using_da else 'remark'}) xt={receipt.extrinsic_hash}", receipt
         else:
             return False, f"DispatchError: {receipt.error_message}", receipt
     except SubstrateRequestException as e:
+        _NONCE_STATE.pop(kp.ss58_address, None)
         return False, str(e), None
     except Exception as e:
+        _NONCE_STATE.pop(kp.ss58_address, None)
         return False, repr(e), None
 
+def _submit_and_watch(sub: SubstrateInterface, xt, wait_finalized: bool, timeout: float = 30.0):
+    """
+    Submit via author_submitAndWatchExtrinsic and watch the status stream
+    ourselves, instead of submit_extrinsic's open-ended blocking wait (which
+    can hang for minutes on a stalled node). Returns (receipt, None) once the
+    target status arrives, or (None, reason) on a terminal status or timeout;
+    on timeout the watch subscription is cancelled so the node stops pushing.
+    """
+    target = "finalized" if wait_finalized else "inBlock"
+    deadline = time.time() + timeout
+    seen = {}
+
+    def on_update(message, update_nr, subscription_id):
+        seen["sub_id"] = subscription_id
+        res = message.get("params", {}).get("result")
+        if isinstance(res, dict):
+            if target in res:
+                seen["block_hash"] = res[target]
+                return message
+            for terminal in ("dropped", "invalid", "usurped", "finalityTimeout"):
+                if terminal in res:
+                    seen["error"] = f"{terminal}: {res[terminal]}"
+                    return message
+        if time.time() > deadline:
+            seen["error"] = f"watch timeout after {timeout:.0f}s"
+            seen["unwatch"] = subscription_id
+            return message
+        return None  # keep watching
+
+    # The deadline check in on_update only runs when a status message arrives,
+    # and the library blocks in websocket.recv() with no socket timeout — a
+    # node that goes silent after ready/broadcast would hang here forever.
+    # Bound each recv with the watch timeout so silence also hits the timeout
+    # path (and still unwatches, if we ever saw the subscription id).
+    ws = getattr(sub, "websocket", None)
+    prev_timeout = ws.gettimeout() if ws is not None else None
+    if ws is not None:
+        ws.settimeout(timeout)
+    try:
+        sub.rpc_request("author_submitAndWatchExtrinsic", [xt.data.to_hex()], result_handler=on_update)
+    except WebSocketTimeoutException:
+        seen.setdefault("error", f"watch timeout after {timeout:.0f}s (node silent)")
+        if "sub_id" in seen:
+            seen["unwatch"] = seen["sub_id"]
+    finally:
+        # unwatch while the recv timeout is still in force, so the cleanup
+        # itself can't hang on the same silent node
+        if "unwatch" in seen:
+            try:
+                sub.rpc_request("author_unwatchExtrinsic", [seen["unwatch"]])
+            except Exception:
+                pass
+        if ws is not None:
+            ws.settimeout(prev_timeout)
+    if "block_hash" in seen:
+        receipt = ExtrinsicReceipt(
+            substrate=sub,
+            extrinsic_hash=f"0x{xt.extrinsic_hash.hex()}" if isinstance(xt.extrinsic_hash, (bytes, bytearray)) else xt.extrinsic_hash,
+            block_hash=seen["block_hash"],
+            finalized=wait_finalized,
+        )
+        return receipt, None
+    return None, seen.get("error", "watch ended without a terminal status")
+
 # ----------------- auto-shrink search -----------------
 def bloat_autoshrink(sub: SubstrateInterface, kp: Keypair, app_id: int,
                      start_bytes: int, start_calls: int, max_calls: int,
                      min_bytes: int, min_calls: int, wait_finalized: bool):
+    # Every probe is a real on-chain submission costing seconds, so bracket the
+    # max accepted call count with exponential doubling and pinpoint it with a
+    # binary search: ~2*log2(max_calls) probes per payload size instead of the
+    # old halving walk plus +10% greedy bumps. A payload size that's outright
+    # too big now costs exactly one rejected probe (at n=min_calls) before we
+    # shrink it. start_calls is kept for CLI compatibility; the exponential
+    # ramp makes an initial guess unnecessary.
     size = max(min_bytes, int(start_bytes))
-    n    = max(min_calls, int(start_calls))
+    min_calls = max(1, int(min_calls))
     max_calls = max(min_calls, int(max_calls))
 
     while size >= min_bytes:
-        print(f"[try] payload_size={size} bytes, start_calls={n}")
-        nn = min(n, max_calls)
+        print(f"[try] payload_size={size} bytes")
+
+        # Exponential ramp: double n while the chain keeps accepting.
+        best_n, best_rcpt = None, None
+        fail_n = None
         last_err = None
-        # shrink call count by halving until it fits or hits 1
-        while nn >= min_calls:
+        nn = min_calls
+        while nn <= max_calls:
             ok, info, rcpt = submit_batch(sub, kp, size, nn, app_id, wait_finalized)
             if ok:
                 print(f"[ok]   size={size}B n={nn} -> {info}")
-                # small greedy bump: +10%
                 best_n, best_rcpt = nn, rcpt
-                probe = min(max_calls, int(nn * 1.1) + 1)
-                while probe > best_n and probe <= max_calls:
-                    ok2, info2, rcpt2 = submit_batch(sub, kp, size, probe, app_id, wait_finalized)
-                    if ok2:
-                        print(f"[ok+]  size={size}B n={probe} -> {info2}")
-                        best_n, best_rcpt = probe, rcpt2
-                        probe = min(max_calls, int(probe * 1.1) + 1)
-                    else:
-                        print(f"[reject] size={size}B n={probe} -> {info2}")
-                        break
-                return size, best_n, best_rcpt
+                if nn == max_calls:
+                    break
+                nn = min(max_calls, nn * 2)
             else:
                 print(f"[reject] size={size}B n={nn} -> {info}")
                 last_err = info
-                nn = max(min_calls, nn // 2)
-                if nn == 1 and "too large" in (last_err or "").lower():
-                    # fall through to payload shrink quickly for length errors
-                    break
+                fail_n = nn
+                break
+
+        if best_n is not None:
+            # Bracketed: binary search (best_n, fail_n) for the largest accepted n.
+            if fail_n is not None:
+                lo, hi = best_n, fail_n - 1
+                while lo < hi:
+                    mid = (lo + hi + 1) // 2
+                    ok, info, rcpt = submit_batch(sub, kp, size, mid, app_id, wait_finalized)
+                    if ok:
+                        print(f"[ok+]  size={size}B n={mid} -> {info}")
+                        best_n, best_rcpt = mid, rcpt
+                        lo = mid
+                    else:
+                        print(f"[reject] size={size}B n={mid} -> {info}")
+                        hi = mid - 1
+            return size, best_n, best_rcpt
 
         # even n=min_calls failed -> shrink payload
         print(f"[shrink] even n={min_calls} failed at size={size}B -> {last_err}")
         if size <= min_bytes:
             raise RuntimeError("Could not fit any payload; lower --chunk-bytes further or relax runtime limits.")
         size //= 2
-        # when we shrink payload, reset n back up a bit
-        n = max(min_calls, start_calls // max(1, int(math.ceil(start_bytes / size))))
 
 # ----------------- CLI -----------------
 def main():
@@ -190,6 +379,14 @@ def main():
     sub = SubstrateInterface(url=args.endpoint, ss58_format=42)
     kp  = Keypair.create_from_uri(args.seed)
 
+    # Pin the runtime metadata up front so every later compose_call /
+    # receipt decode hits the warm cache instead of re-fetching
+    # state_getRuntimeVersion/state_getMetadata mid-search.
+    try:
+        sub.init_runtime()
+    except Exception as e:
+        print(f"init_runtime failed ({e}); metadata will load lazily")
+
     print("=== Telemetry BEFORE ===")
     print(json.dumps(telemetry(sub), indent=2))
 
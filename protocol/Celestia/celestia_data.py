@@ -4,6 +4,31 @@ from pathlib import Path
 import sys
 import binascii
 
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+# orjson parses/serializes JSON several times faster than the stdlib and
+# matters once blob payloads get large; fall back to stdlib json when the
+# package isn't installed. _dumps always returns bytes.
+try:
+    import orjson
+    _loads = orjson.loads
+    _dumps = orjson.dumps
+except ImportError:
+    _loads = json.loads
+    def _dumps(obj):
+        return json.dumps(obj).encode()
+
+# Shared session for all RPC calls: keeps the TCP+TLS connection alive between
+# requests instead of paying a fresh handshake per call, and retries transient
+# 5xx responses from the public endpoint.
+_SESSION = requests.Session()
+_SESSION.mount("https://", HTTPAdapter(
+    pool_connections=2,
+    pool_maxsize=4,
+    max_retries=Retry(total=3, backoff_factor=0.3, status_forcelist=[502, 503, 504]),
+))
+
 # === CONFIG ===
 # PublicNode Mocha RPC (community free endpoint). If your provider uses a different path remove /v1/jsonrpc.
 RPC_JSONRPC_URL = "https://celestia-mocha-rpc.publicnode.com:443/v1/jsonrpc"
@@ -40,10 +65,11 @@ def rpc_request(method: str, params: list):
     headers = {"Content-Type": "application/json"}
     if AUTH_TOKEN:
         headers["Authorization"] = AUTH_TOKEN
-    resp = requests.post(RPC_JSONRPC_URL, json=body, headers=headers, timeout=30)
+    resp = _SESSION.post(RPC_JSONRPC_URL, data=_dumps(body), headers=headers, timeout=30)
     # Raise for HTTP errors, but keep JSON body if present for debug
     resp.raise_for_status()
-    return resp.json()
+    # parse from .content: skips the charset-decode pass .json()/.text do
+    return _loads(resp.content)
 
 # === MAIN ===
 def submit_blob(namespace_hex: str, file_path: str):
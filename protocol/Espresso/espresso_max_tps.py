@@ -14,37 +14,92 @@ python espresso_stresstest_async.py \
 import asyncio
 import base64
 import argparse
+import hashlib
 import json
+import sys
 import time
+from collections import defaultdict
 from typing import Optional, Dict, List, Tuple, Any
 
 import aiohttp
 
+# uvloop (libuv event loop) is a drop-in 2-4x scheduling win for aiohttp-heavy
+# fan-outs; optional, and not available on Windows
+if sys.platform != "win32":
+    try:
+        import uvloop
+        uvloop.install()
+    except ImportError:
+        pass
+
+# orjson keeps JSON decode off the event loop's critical path (2-5x stdlib on
+# these payloads); optional, stdlib fallback otherwise. _dumps returns bytes.
+try:
+    import orjson
+    _loads = orjson.loads
+    _dumps = orjson.dumps
+except ImportError:
+    _loads = json.loads
+    def _dumps(obj):
+        return json.dumps(obj).encode()
+
+# optional: ijson streams the block/namespace responses tx-by-tx off the
+# socket instead of buffering the whole document
+try:
+    import ijson
+except ImportError:
+    ijson = None
+
+# Payloads above this get base64-encoded in the default thread executor
+# instead of on the event loop (see submit()).
+_EXECUTOR_B64_THRESHOLD = 64 * 1024
+
 # ---------------------- Async Espresso client ----------------------
 
 
 class AsyncEspressoDAClient:
-    def __init__(self, base_url: str = "https://query.main.net.espresso.network", api_version: str = "v1", timeout: int = 30):
+    def __init__(self, base_url: str = "https://query.main.net.espresso.network", api_version: str = "v1", timeout: int = 30, connector_limit: int = 256):
         base = base_url.rstrip("/")
         ver = f"/{api_version}" if api_version else ""
         self.submit_url = f"{base}{ver}/submit/submit"
         self.availability_base = f"{base}{ver}/availability"
+        self.status_base = f"{base}{ver}/status"
+        # the inclusion sweep hits this once per tick; build it once here
+        self.block_height_url = f"{self.status_base}/block-height"
         # aiohttp session will be created in async context
         self._session: Optional[aiohttp.ClientSession] = None
         self._timeout = aiohttp.ClientTimeout(total=timeout, sock_connect=10, sock_read=10)
+        self._connector_limit = connector_limit
 
     async def __aenter__(self):
-        self._session = aiohttp.ClientSession(timeout=self._timeout)
+        # Tuned connector: the default per-host limit (100) silently queues
+        # requests once concurrency climbs past it, and without keepalive/DNS
+        # caching every poll can pay a fresh TLS handshake + lookup. Common
+        # headers live on the session instead of every call.
+        connector = aiohttp.TCPConnector(
+            limit=self._connector_limit,
+            limit_per_host=self._connector_limit,
+            ttl_dns_cache=300,
+            keepalive_timeout=30,
+            enable_cleanup_closed=True,
+        )
+        self._session = aiohttp.ClientSession(
+            timeout=self._timeout,
+            connector=connector,
+            headers={"Accept": "application/json", "Content-Type": "application/json"},
+        )
         return self
 
     async def __aexit__(self, exc_type, exc, tb):
         if self._session:
             await self._session.close()
 
-    async def submit(self, namespace: int, payload: bytes, *, retries: int = 3, backoff_base: float = 0.25) -> str:
+    async def submit(self, namespace: int, payload: bytes, *, retries: int = 3, backoff_base: float = 0.25, timeout: Optional[float] = None) -> str:
         """
         Submit bytes to Espresso DA. Returns tagged tx string like "TX~..."
-        Retries with exponential backoff on transient failures.
+        Retries with exponential backoff on transient failures. `timeout`
+        bounds each attempt via aiohttp's own per-request timeout — handled
+        in the transport, no wrapper task per call like asyncio.wait_for.
         """
         if not self._session:
             raise RuntimeError("Session not created; use 'async with AsyncEspressoDAClient(...) as client'")
@@ -52,25 +107,38 @@ class AsyncEspressoDAClient:
         if not (0 <= namespace <= 2**32 - 1):
             raise ValueError("namespace must fit in uint32")
 
-        body = {"namespace": int(namespace), "payload": base64.b64encode(payload).decode("ascii")}
+        req_timeout = aiohttp.ClientTimeout(total=timeout) if timeout is not None else self._timeout
+
+        # encode + serialize once; retries resend the same bytes instead of
+        # re-running b64 + JSON per attempt. Big payloads get base64-encoded
+        # in a thread: b64encode releases the GIL on the C fast path, so for
+        # >64 KiB the event loop keeps servicing other submits instead of
+        # stalling; below that the executor hand-off costs more than it saves.
+        if len(payload) > _EXECUTOR_B64_THRESHOLD:
+            b64 = await asyncio.get_running_loop().run_in_executor(None, base64.b64encode, payload)
+        else:
+            b64 = base64.b64encode(payload)
+        body_bytes = _dumps({"namespace": int(namespace), "payload": b64.decode("ascii")})
         last_exc = None
         for attempt in range(1, retries + 1):
             try:
-                async with self._session.post(self.submit_url, json=body, headers={"Accept": "application/json", "Content-Type": "application/json"}) as resp:
-                    text = await resp.text()
-                    if resp.status != 200:
-                        # treat 429/5xx as retryable; 4xx other than 429 as fatal
-                        if resp.status in (429, 500, 502, 503, 504):
-                            last_exc = RuntimeError(f"HTTP {resp.status}: {text}")
-                            # fallthrough to retry
-                        else:
-                            raise RuntimeError(f"HTTP {resp.status}: {text}")
-                    else:
+                async with self._session.post(self.submit_url, data=body_bytes, timeout=req_timeout) as resp:
+                    # branch on status first: the body is read (and decoded)
+                    # exactly once per response instead of text + json passes
+                    if resp.status == 200:
+                        raw = await resp.read()
+                        t = raw.strip()
+                        # fast path: many deployments answer with a bare
+                        # tagged "TX~..." string — skip the JSON parse that's
+                        # guaranteed to raise on it (a JSON response starts
+                        # with '{', '[' or '"')
+                        if t.startswith(b"TX~") or (t and t[:1] not in (b"{", b"[", b'"')):
+                            return t.decode(errors="replace")
                         # parse JSON or plain string
                         try:
-                            data = await resp.json(content_type=None)
+                            data = _loads(raw)
                         except Exception:
-                            data = text.strip()
+                            data = raw.decode(errors="replace").strip()
                         # try to extract tx string
                         if isinstance(data, str) and data:
                             return data
@@ -80,9 +148,16 @@ class AsyncEspressoDAClient:
                                 if isinstance(v, str) and v:
                                     return v
                         # fallback: return text if it looks like TX~...
-                        if isinstance(text, str) and text.strip():
-                            return text.strip()
+                        text = raw.decode(errors="replace").strip()
+                        if text:
+                            return text
                         raise RuntimeError(f"Unexpected submit response: {data!r}")
+                    # treat 429/5xx as retryable; 4xx other than 429 as fatal
+                    elif resp.status in (429, 500, 502, 503, 504):
+                        last_exc = RuntimeError(f"HTTP {resp.status}: {await resp.text()}")
+                        # fallthrough to retry
+                    else:
+                        raise RuntimeError(f"HTTP {resp.status}: {await resp.text()}")
             except Exception as e:
                 last_exc = e
                 if attempt < retries:
@@ -91,70 +166,148 @@ class AsyncEspressoDAClient:
                 break
         raise last_exc
 
-    async def get_tx_by_hash(self, tx_hash: str) -> Optional[dict]:
-        """Return JSON meta if included, or None if 404/not found"""
-        if not self._session:
-            raise RuntimeError("Session not created")
-        url = f"{self.availability_base}/transaction/hash/{tx_hash.strip()}"
-        async with self._session.get(url, headers={"Accept": "application/json"}) as resp:
+    def _tx_url(self, tx_hash: str) -> str:
+        return f"{self.availability_base}/transaction/hash/{tx_hash.strip()}"
+
+    async def _get_tx_info(self, url: str) -> Optional[dict]:
+        async with self._session.get(url) as resp:
             if resp.status == 404:
                 return None
             if resp.status == 200:
-                return await resp.json()
+                return _loads(await resp.read())
             # non-200 but non-404 -> treat as None for polling
             return None
 
-    async def wait_for_inclusion(self, tx_hash: str, timeout_sec: int = 90, poll_every: float = 2.0) -> Tuple[bool, Optional[dict]]:
+    async def get_tx_by_hash(self, tx_hash: str) -> Optional[dict]:
+        """Return JSON meta if included, or None if 404/not found"""
+        if not self._session:
+            raise RuntimeError("Session not created")
+        return await self._get_tx_info(self._tx_url(tx_hash))
+
+    async def wait_for_inclusion(self, tx_hash: str, timeout_sec: int = 90, initial_poll: float = 0.5, max_poll: float = 5.0, request_sem: Optional[asyncio.Semaphore] = None) -> Tuple[bool, Optional[dict]]:
         """
         Poll inclusion endpoint until found or timeout.
         Returns (found, metadata-or-none)
+
+        Polling is adaptive: start at initial_poll and double up to max_poll
+        on every miss. A fixed 2s tick across num x concurrency waiters was a
+        polling storm against the availability endpoint; backoff keeps the
+        fast first probes (most txs land within a block or two) while cutting
+        steady-state GETs severalfold on long-tail inclusions.
+
+        request_sem, when given, bounds only the in-flight GETs: the waiter
+        sleeps outside the semaphore, so a slot is held for the duration of
+        one request rather than a whole (up to 90s) wait.
         """
+        if not self._session:
+            raise RuntimeError("Session not created")
+        # format the polling URL once per waiter; with num x concurrency
+        # waiters each polling for up to timeout_sec this f-string (plus the
+        # strip) otherwise reruns on every probe
+        url = self._tx_url(tx_hash)
         deadline = time.time() + timeout_sec
+        delay = initial_poll
         while time.time() < deadline:
-            info = await self.get_tx_by_hash(tx_hash)
+            try:
+                if request_sem is not None:
+                    async with request_sem:
+                        info = await self._get_tx_info(url)
+                else:
+                    info = await self._get_tx_info(url)
+            except Exception:
+                info = None
             if info:
                 return True, info
-            await asyncio.sleep(poll_every)
+            await asyncio.sleep(min(delay, max(0.0, deadline - time.time())))
+            delay = min(delay * 2.0, max_poll)
         return False, None
 
-    async def read_block_namespace(self, height: int, namespace: int) -> List[Dict[str, Any]]:
-        """List all transactions in a block for a namespace (returns list of tx dicts)"""
+    async def latest_block_height(self) -> Optional[int]:
+        """Current chain height from the status endpoint, or None if unavailable."""
+        if not self._session:
+            raise RuntimeError("Session not created")
+        try:
+            async with self._session.get(self.block_height_url) as resp:
+                if resp.status != 200:
+                    return None
+                return int((await resp.text()).strip())
+        except Exception:
+            return None
+
+    @staticmethod
+    def _mk_tx(tx: dict, include_text: bool) -> Optional[Dict[str, Any]]:
+        """Normalize one raw namespace tx into the dict shape callers expect."""
+        b64 = tx.get("payload")
+        ns = tx.get("namespace")
+        if not (isinstance(b64, str) and ns is not None):
+            return None
+        pb = base64.b64decode(b64)
+        text = None
+        if include_text:
+            try:
+                text = pb.decode("utf-8")
+            except Exception:
+                text = None
+        return {"namespace": int(ns), "payload_b64": b64, "payload_bytes": pb, "payload_text": text}
+
+    async def iter_block_txs(self, height: int, namespace: int, include_text: bool = False):
+        """
+        Yield transactions in a block for a namespace, one dict at a time.
+
+        With ijson installed the response is parsed straight off the socket,
+        so peak memory is one transaction instead of the whole block (raw
+        JSON + base64 strings + decoded bytes); callers can also break early.
+        Without it the body is buffered and decoded in one go as before.
+        """
         if not self._session:
             raise RuntimeError("Session not created")
         url = f"{self.availability_base}/block/{int(height)}/namespace/{int(namespace)}"
-        async with self._session.get(url, headers={"Accept": "application/json"}) as resp:
+        async with self._session.get(url) as resp:
             if resp.status == 404:
-                return []
+                return
             resp.raise_for_status()
-            body = await resp.json()
-            out = []
-            for tx in body.get("transactions", []):
-                b64 = tx.get("payload")
-                ns = tx.get("namespace")
-                if isinstance(b64, str) and ns is not None:
-                    pb = base64.b64decode(b64.encode("ascii"))
-                    try:
-                        text = pb.decode("utf-8")
-                    except Exception:
-                        text = None
-                    out.append({"namespace": int(ns), "payload_b64": b64, "payload_bytes": pb, "payload_text": text})
-            return out
+            if ijson is not None:
+                async for tx in ijson.items(resp.content, "transactions.item"):
+                    item = self._mk_tx(tx, include_text)
+                    if item is not None:
+                        yield item
+            else:
+                body = _loads(await resp.read())
+                for tx in body.get("transactions", []):
+                    item = self._mk_tx(tx, include_text)
+                    if item is not None:
+                        yield item
+
+    async def read_block_namespace(self, height: int, namespace: int, include_text: bool = False) -> List[Dict[str, Any]]:
+        """
+        List all transactions in a block for a namespace (returns list of tx dicts).
+
+        payload_text is only decoded when include_text is set — the inclusion
+        sweep calls this once per block and only needs payload_bytes, so the
+        per-tx UTF-8 decode attempt would be pure overhead there.
+        """
+        return [tx async for tx in self.iter_block_txs(height, namespace, include_text)]
 
 
 # ---------------------- Helper / runner ----------------------
 
 
-def mk_payload(base: bytes, idx: int, size: int) -> bytes:
-    """Generate deterministic-ish payload of approximately 'size' bytes"""
-    s = base + f"#{idx}".encode("ascii") + b"-" + str(int(time.time() * 1000)).encode("ascii")
+def mk_payload(base: bytes, idx: int, size: int, ts_bytes: Optional[bytes] = None) -> bytes:
+    """Generate deterministic-ish payload of approximately 'size' bytes.
+
+    ts_bytes is the run timestamp, computed once per run by the caller: the
+    per-call time.time()->int->str->encode churn bought nothing (all txs in a
+    run got near-identical stamps) and made payloads irreproducible.
+    """
+    if ts_bytes is None:
+        ts_bytes = str(int(time.time() * 1000)).encode("ascii")
+    s = base + b"#" + str(idx).encode("ascii") + b"-" + ts_bytes
     if len(s) >= size:
         return s[:size]
-    # repeat until we hit size
-    pieces = []
-    while sum(len(p) for p in pieces) < size:
-        pieces.append(s)
-    data = b"".join(pieces)[:size]
-    return data
+    # one C-level bytes multiply + slice; the old append loop re-summed all
+    # piece lengths on every iteration (quadratic in repeat count) and then
+    # copied everything again in the join
+    return (s * ((size + len(s) - 1) // len(s)))[:size]
 
 
 async def submit_many_and_wait(
@@ -165,6 +318,8 @@ async def submit_many_and_wait(
     payload_size: int,
     submit_timeout: int,
     include_timeout: int,
+    initial_poll: float = 0.5,
+    max_poll: float = 5.0,
 ) -> Tuple[List[Tuple[str, Optional[int]]], List[Tuple[str, str]]]:
     """
     Submit `num` txs concurrently (limit concurrency), wait for inclusion for each.
@@ -172,49 +327,103 @@ async def submit_many_and_wait(
       - included: list of (tx_hash, block_height_or_None)
       - failed: list of (tx_hash_or_label, error_text)
     """
-    semaphore = asyncio.Semaphore(concurrency)
     submitted_hashes: List[str] = []
     failed_submissions: List[Tuple[str, str]] = []
     base_msg = b"Espresso async stress test payload "
+    # one timestamp per run, shared by all payloads
+    run_ts = str(int(time.time() * 1000)).encode("ascii")
 
     async def do_submit(idx: int):
         nonlocal submitted_hashes
-        payload = mk_payload(base_msg, idx, payload_size)
+        payload = mk_payload(base_msg, idx, payload_size, run_ts)
         try:
-            # timeout for submit: use asyncio.wait_for around client.submit
-            txh = await asyncio.wait_for(client.submit(namespace, payload, retries=4), timeout=submit_timeout)
+            # per-attempt timeout handled inside aiohttp's transport
+            txh = await client.submit(namespace, payload, retries=4, timeout=submit_timeout)
             submitted_hashes.append(txh)
-            return txh, None
+            return txh, payload, None
         except Exception as e:
             err = str(e)
             failed_submissions.append((f"submit#{idx}", err))
-            return None, err
+            return None, payload, err
+
+    # Snapshot the chain tip before submitting so the block sweep below knows
+    # where inclusions can start.
+    start_height = await client.latest_block_height()
+
+    # Submit many: a fixed pool of `concurrency` workers pulling indices off
+    # a bounded queue, instead of pre-spawning one Task per tx — constant
+    # memory and a calm ready-queue even at num in the tens of thousands.
+    results: List[Optional[Tuple[Optional[str], bytes, Optional[str]]]] = [None] * num
+    work_q: asyncio.Queue = asyncio.Queue(maxsize=concurrency * 2)
+    n_workers = max(1, min(concurrency, num))
+
+    async def submit_worker():
+        while True:
+            idx = await work_q.get()
+            if idx is None:
+                return
+            results[idx] = await do_submit(idx)
+
+    async with asyncio.TaskGroup() as tg:
+        for _ in range(n_workers):
+            tg.create_task(submit_worker())
+        for i in range(num):
+            await work_q.put(i)
+        for _ in range(n_workers):
+            await work_q.put(None)
 
-    # Submit many (concurrent)
-    submit_tasks = []
-
-    async def submit_worker(i):
-        async with semaphore:
-            return await do_submit(i)
-
-    for i in range(num):
-        submit_tasks.append(asyncio.create_task(submit_worker(i)))
-
-    # gather submissions
-    results = await asyncio.gather(*submit_tasks)
     # collect successful tx hashes in order of creation
     tx_hashes = [r[0] for r in results if r[0] is not None]
 
     if not tx_hashes:
         return [], failed_submissions
 
-    # Poll inclusion concurrently (but don't exceed concurrency)
     included: List[Tuple[str, Optional[int]]] = []
     included_failures: List[Tuple[str, str]] = []
 
-    async def poll_one(txh: str):
-        async with semaphore:
-            found, meta = await client.wait_for_inclusion(txh, timeout_sec=include_timeout, poll_every=2.0)
+    if start_height is not None:
+        # Block-sweep indexer: all txs land in the same few blocks, so one
+        # namespace GET per new block replaces a per-tx polling storm —
+        # O(blocks seen) requests instead of O(num_txs x polls). Submitted
+        # payloads are unique (they embed the index), so a SHA-256 of the
+        # payload identifies each tx in the namespace slice.
+        pending: Dict[str, str] = {
+            hashlib.sha256(payload).hexdigest(): txh
+            for txh, payload, err in results if txh is not None
+        }
+        deadline = time.time() + include_timeout
+        # back up a couple of blocks in case the tip moved while submitting
+        height = max(0, start_height - 2)
+        while pending and time.time() < deadline:
+            tip = await client.latest_block_height()
+            if tip is None:
+                await asyncio.sleep(initial_poll)
+                continue
+            swept = False
+            while height < tip and pending and time.time() < deadline:
+                try:
+                    txs = await client.read_block_namespace(height, namespace)
+                except Exception:
+                    break  # transient failure: retry this height next tick
+                for t in txs:
+                    txh = pending.pop(hashlib.sha256(t["payload_bytes"]).hexdigest(), None)
+                    if txh is not None:
+                        included.append((txh, height))
+                height += 1
+                swept = True
+            if not swept:
+                await asyncio.sleep(initial_poll)
+        for txh in pending.values():
+            included_failures.append((txh, "timeout"))
+    else:
+        # status endpoint unavailable: fall back to per-tx inclusion polling.
+        # Every tx gets a waiter (a mostly-sleeping task is cheap); the
+        # semaphore bounds in-flight GETs only, so `concurrency` txs aren't
+        # camped on slots for the full include_timeout while the rest starve.
+        request_sem = asyncio.Semaphore(concurrency)
+
+        async def poll_one(txh: str):
+            found, meta = await client.wait_for_inclusion(txh, timeout_sec=include_timeout, initial_poll=initial_poll, max_poll=max_poll, request_sem=request_sem)
             if found and meta:
                 height = meta.get("block_height") or meta.get("blockHeight") or meta.get("height")
                 # some APIs return block number as string; normalize to int when possible
@@ -227,8 +436,9 @@ async def submit_many_and_wait(
             else:
                 included_failures.append((txh, "timeout"))
 
-    poll_tasks = [asyncio.create_task(poll_one(h)) for h in tx_hashes]
-    await asyncio.gather(*poll_tasks)
+        async with asyncio.TaskGroup() as tg:
+            for h in tx_hashes:
+                tg.create_task(poll_one(h))
 
     # return included + submission failures as 'failed' with reason
     failed_all = failed_submissions + [(h, reason) for (h, reason) in included_failures]
@@ -236,7 +446,8 @@ async def submit_many_and_wait(
 
 
 async def main_async(args):
-    async with AsyncEspressoDAClient(base_url=args.base, api_version=args.api, timeout=args.http_timeout) as client:
+    connector_limit = args.connector_limit or max(256, args.concurrency * 2)
+    async with AsyncEspressoDAClient(base_url=args.base, api_version=args.api, timeout=args.http_timeout, connector_limit=connector_limit) as client:
         print(f"Connected to {args.base} (api={args.api}). Submitting {args.num} txs with concurrency {args.concurrency} ...")
         included, failed = await submit_many_and_wait(
             client,
@@ -246,6 +457,8 @@ async def main_async(args):
             payload_size=args.payload_size,
             submit_timeout=args.submit_timeout,
             include_timeout=args.include_timeout,
+            initial_poll=args.initial_poll,
+            max_poll=args.max_poll,
         )
 
         print("\n--- Submission summary ---")
@@ -258,14 +471,17 @@ async def main_async(args):
                 print(" ", f)
 
         # Group by block
-        by_block: Dict[Optional[int], List[str]] = {}
+        by_block: Dict[Optional[int], List[str]] = defaultdict(list)
         for txh, h in included:
-            by_block.setdefault(h, []).append(txh)
+            by_block[h].append(txh)
         print("\n=== Inclusion by block ===")
         if not by_block:
             print("No inclusions observed.")
         else:
-            for h, lst in sorted(by_block.items(), key=lambda kv: (kv[0] if kv[0] is not None else -1)):
+            # sort the height keys only; no item tuples or per-compare
+            # conditionals over (key, list) pairs
+            for h in sorted(by_block, key=lambda x: -1 if x is None else x):
+                lst = by_block[h]
                 label = f"block {h}" if h is not None else "no-block"
                 print(f"{label}: {len(lst)} tx(s)")
 
@@ -281,7 +497,7 @@ async def main_async(args):
 
         if target_block is not None:
             print(f"\nFetching namespace {args.namespace} contents for block {target_block} ...")
-            txs = await client.read_block_namespace(target_block, args.namespace)
+            txs = await client.read_block_namespace(target_block, args.namespace, include_text=True)
             print(f"Found {len(txs)} tx(s) in block {target_block} for namespace {args.namespace}")
             for i, t in enumerate(txs):
                 preview = t["payload_text"] or f"<{len(t['payload_bytes'])} bytes binary>"
@@ -302,6 +518,9 @@ def parse_args():
     p.add_argument("--submit-timeout", type=int, default=15, help="Timeout (s) for each submit call")
     p.add_argument("--include-timeout", type=int, default=90, help="Timeout (s) to wait for inclusion per tx")
     p.add_argument("--http-timeout", type=int, default=30, help="HTTP client total timeout (s)")
+    p.add_argument("--connector-limit", type=int, default=0, help="Connection pool size (0 = max(256, 2x concurrency))")
+    p.add_argument("--initial-poll", type=float, default=0.5, help="First inclusion-poll delay (s), doubles on each miss")
+    p.add_argument("--max-poll", type=float, default=5.0, help="Inclusion-poll delay cap (s)")
     return p.parse_args()
 
 
@@ -1,23 +1,54 @@
 
 import requests
 import json
+import threading
+import time
+
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+# Shared session: the stats endpoint gets polled in a loop by the collector,
+# so keep one TLS connection alive instead of a handshake per call and retry
+# transient errors at the transport layer.
+_SESSION = requests.Session()
+_SESSION.mount("https://", HTTPAdapter(
+    pool_connections=1,
+    pool_maxsize=4,
+    max_retries=Retry(total=3, backoff_factor=0.25, status_forcelist=[429, 500, 502, 503, 504]),
+))
+
+# Last good (monotonic_ts, tps) pair: NEAR stats don't change faster than a
+# block, so callers polling in a loop get the cached value for _TTL seconds
+# instead of one upstream request per call. Lock because the collector runs
+# fetchers from worker threads.
+_TTL = 10.0
+_CACHE = None
+_CACHE_LOCK = threading.Lock()
 
 def fetch_tps_data():
     """
     Fetch TPS data from NEAR Blocks API
     """
+    global _CACHE
     API_URL = "https://api.nearblocks.io/v1/stats"
-    
+
+    now = time.monotonic()
+    with _CACHE_LOCK:
+        if _CACHE is not None and now - _CACHE[0] < _TTL:
+            return _CACHE[1]
+
     try:
-        response = requests.get(API_URL)
+        response = _SESSION.get(API_URL, timeout=(3.05, 10))
         data = response.json()
-        
+
         if 'stats' in data and len(data['stats']) > 0:
             tps = float(data['stats'][0].get('tps', 0))
+            with _CACHE_LOCK:
+                _CACHE = (now, tps)
             return tps
-            
+
         return 0.0
-        
+
     except Exception as e:
         print(f"NEAR TPS Error: {str(e)}")
         return 0.0
@@ -1,8 +1,20 @@
 import asyncio
+import json
+import sys
+import time
 from py_near.account import Account
+from py_near.transactions import create_function_call_action
 from dotenv import load_dotenv
 import os
 
+# optional: uvloop speeds up the concurrent send/poll phases; not on Windows
+if sys.platform != "win32":
+    try:
+        import uvloop
+        uvloop.install()
+    except ImportError:
+        pass
+
 load_dotenv()
 
 # --- Configuration ---
@@ -15,8 +27,15 @@ PRIVATE_KEY = os.getenv("NEAR_PRIVATE_KEY")
 # The contract ID you want to interact with
 CONTRACT_ID = os.getenv("NEAR_CONTRACT_ID")# The network to connect to (testnet or mainnet)
 NETWORK_URL = "https://near-testnet.gateway.tatum.io/"
-# Number of transactions to send
+# Number of contract calls to send
 NUM_TRANSACTIONS = 1000
+# NEAR allows many actions per transaction; 50 function calls keeps each tx
+# comfortably under the per-tx gas ceiling at 20 TGas per call
+ACTIONS_PER_TX = 50
+GAS_PER_CALL = 20_000_000_000_000  # 20 TGas
+# Inclusion-check phase
+INCLUDE_TIMEOUT = 60.0
+POLL_CONCURRENCY = 10
 
 async def send_multiple_transactions():
     """
@@ -31,25 +50,62 @@ async def send_multiple_transactions():
     print(f"Account '{ACCOUNT_ID}' loaded.")
     print(f"Sending {NUM_TRANSACTIONS} transactions to '{CONTRACT_ID}'...")
 
-    # Create a list of tasks to run concurrently
+    # Pack the calls into multi-action transactions: one signed tx carrying
+    # ACTIONS_PER_TX function_call actions costs a single nonce and a single
+    # network round-trip, instead of 1000 separate transactions racing the
+    # same access key (and tripping InvalidNonce retries).
     tasks = []
-    for i in range(NUM_TRANSACTIONS):
-        sample_data = f"Hello from Gemini CLI! (tx {i+1})"
-        task = account.function_call(
+    for start in range(0, NUM_TRANSACTIONS, ACTIONS_PER_TX):
+        actions = [
+            create_function_call_action(
+                "submit_data",
+                json.dumps({"data": f"Hello from Gemini CLI! (tx {i+1})"}).encode("utf8"),
+                GAS_PER_CALL,
+                0,
+            )
+            for i in range(start, min(start + ACTIONS_PER_TX, NUM_TRANSACTIONS))
+        ]
+        tasks.append(account.sign_and_send_transaction(
             CONTRACT_ID,
-            "submit_data",
-            {"data": sample_data},
+            actions,
             nowait=True  # Send transaction and don't wait for the result
-        )
-        tasks.append(task)
+        ))
 
     try:
-        # Run all transactions concurrently
+        # Run the batched transactions concurrently
         results = await asyncio.gather(*tasks)
 
-        print(f"{NUM_TRANSACTIONS} transactions sent successfully!")
-        for i, tx_hash in enumerate(results):
-            print(f"  Transaction {i+1}: {tx_hash}")
+        print(f"{NUM_TRANSACTIONS} calls sent in {len(results)} transactions!")
+
+        # nowait=True only means "accepted by the RPC" — without a follow-up
+        # check the script can't tell whether anything actually landed in a
+        # block. Poll the tx status with adaptive backoff (200ms doubling to
+        # 2s; UNKNOWN_TRANSACTION just means "not yet"), holding the
+        # concurrency gate only around the RPC call, never the sleep.
+        sem = asyncio.Semaphore(POLL_CONCURRENCY)
+
+        async def wait_inclusion(tx_hash):
+            delay = 0.2
+            deadline = time.monotonic() + INCLUDE_TIMEOUT
+            while time.monotonic() < deadline:
+                async with sem:
+                    try:
+                        await account._provider.json_rpc("tx", [tx_hash, ACCOUNT_ID])
+                        return tx_hash, True
+                    except Exception:
+                        pass  # not yet known, or transient RPC error: retry
+                await asyncio.sleep(min(delay, max(0.0, deadline - time.monotonic())))
+                delay = min(delay * 2, 2.0)
+            return tx_hash, False
+
+        outcomes = await asyncio.gather(*(wait_inclusion(h) for h in results))
+        included = [h for h, ok in outcomes if ok]
+        failed = [h for h, ok in outcomes if not ok]
+        print(f"Included: {len(included)}/{len(results)} transactions")
+        if failed:
+            print(f"Not confirmed within {INCLUDE_TIMEOUT:.0f}s ({len(failed)}):")
+            for h in failed[:10]:
+                print(f"  {h}")
 
     except Exception as e:
         print(f"An error occurred: {e}")
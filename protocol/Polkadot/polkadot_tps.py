@@ -42,29 +42,11 @@ def fetch_block_info(page=0, row=100):
             total_events_count = 0      
             
             
-            # Process each block
+            # Process each block; only the two counters are actually used, so
+            # skip the per-block datetime conversion and unused bindings
             for block in blocks:
-                block_num = block.get('block_num')
-                timestamp = datetime.fromtimestamp(block.get('block_timestamp'))
-                extrinsics = block.get('extrinsics_count', 0)
-                additional_meta = block.get('additional_meta', {})
-                
-                # Extract data submission metrics
-                extrinsics_data_count = block.get('extrinsics_count', 0)
-                events_data_count = block.get('event_count', 0)
-
-                # Update totals
-                total_extrinsics_count += extrinsics_data_count
-                total_events_count += events_data_count
-
-                # Additional block details if needed
-
-                # print(f"\nBlock #{block_num}")
-                # print(f"Timestamp: {timestamp}")
-                # print(f"Extrinsics count: {extrinsics}")
-                # print(f"Block hash: {block.get('hash')}")
-                # print(f"additional_meta: {additional_meta}")
-                # print("-" * 50)
+                total_extrinsics_count += block.get('extrinsics_count', 0)
+                total_events_count += block.get('event_count', 0)
 
             # Calculate averages
             avg_data_size = total_data_size / len(blocks) if blocks else 0